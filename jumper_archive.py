@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Archive des réponses brutes de l'API (segments NDJSON compressés) et rejeu hors ligne
+Permet de re-normaliser tout l'historique après un changement de build_transaction_dict, sans réseau
+"""
+import argparse
+import atexit
+import datetime as dt
+import gzip
+import json
+import os
+import threading
+import time
+
+import jumper_volume as jv
+
+# ==================== CONFIGURATION ====================
+ARCHIVE_DIR = os.environ.get("JUMPER_ARCHIVE_DIR")  # Désactivée si non défini
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024                # Taille (non compressée) d'un segment
+
+# ==================== ÉCRITURE ====================
+def response_kind(url: str) -> str:
+    """Type de réponse archivée d'après l'URL appelée"""
+    if url == jv.API_URL:
+        return "transfers"
+    if url == jv.STATUS_URL:
+        return "status"
+    if url == jv.CHAINS_URL:
+        return "chains"
+    return "other"
+
+class PageArchive:
+    """Écrit chaque réponse brute réussie dans des segments .ndjson.gz tournants"""
+    def __init__(self, directory: str = ARCHIVE_DIR):
+        self.directory = directory
+        self.lock = threading.Lock()
+        self.segment = None
+        self.written = 0
+        self.seq = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def attach(self):
+        """Archive désormais toutes les réponses de jumper_volume"""
+        if self.record not in jv.response_hooks:
+            jv.response_hooks.append(self.record)
+            atexit.register(self.close)
+        return self
+
+    def detach(self):
+        if self.record in jv.response_hooks:
+            jv.response_hooks.remove(self.record)
+        self.close()
+
+    def record(self, url: str, params: dict, r):
+        """Hook jumper_volume : une ligne NDJSON par réponse, corps brut inclus tel quel"""
+        body = r.content
+        if b"\n" in body:
+            body = json.dumps(jv.decode_json(r), separators=(",", ":")).encode("utf-8")
+        head = json.dumps({"t": time.time(), "kind": response_kind(url), "params": params},
+                          separators=(",", ":"), default=str).encode("utf-8")
+        line = head[:-1] + b',"body":' + body + b"}\n"
+        with self.lock:
+            if self.segment is None or self.written >= SEGMENT_MAX_BYTES:
+                self._rotate()
+            self.segment.write(line)
+            self.written += len(line)
+
+    def _rotate(self):
+        if self.segment is not None:
+            self.segment.close()
+        self.seq += 1
+        stamp = dt.datetime.now(dt.timezone.utc).strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.directory, f"pages-{stamp}-{os.getpid()}-{self.seq:04d}.ndjson.gz")
+        self.segment = gzip.open(path, "wb", compresslevel=6)
+        self.written = 0
+
+    def close(self):
+        with self.lock:
+            if self.segment is not None:
+                self.segment.close()
+                self.segment = None
+
+# ==================== REJEU ====================
+def segments(directory: str) -> list:
+    """Segments de l'archive par date d'ouverture (plusieurs processus peuvent écrire en parallèle :
+    l'ordre des réponses est donné par le champ t de chaque enregistrement)"""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.startswith("pages-") and name.endswith(".ndjson.gz")
+    )
+
+def iter_records(directory: str, kinds: tuple = ("transfers", "status", "chains")):
+    """Lit l'archive en flux, segment par segment, sans tout charger en mémoire"""
+    for path in segments(directory):
+        with gzip.open(path, "rb") as f:
+            try:
+                for line in f:
+                    try:
+                        record = jv.json_loads(line)
+                    except ValueError:
+                        continue  # Dernière ligne tronquée d'un segment interrompu
+                    if record.get("kind") in kinds:
+                        yield record
+            except (EOFError, OSError) as e:
+                print(f"⚠️ Segment incomplet {os.path.basename(path)}: {e}")
+
+def item_key(item: dict) -> str:
+    """Même clé que build_transaction_dict (txHash d'envoi, sinon transactionId)"""
+    return (item.get("sending") or {}).get("txHash") or item.get("transactionId") or ""
+
+def in_scope(params: dict, wallet: str, integrator: str) -> bool:
+    """Page crawlée exactement pour ce périmètre (wallet None : crawls de tout l'intégrateur)"""
+    return ((params.get("integrator") or jv.INTEGRATOR) == integrator
+            and (params.get("wallet") or "").lower() == (wallet or "").lower())
+
+def iter_items(directory: str, wallet: str = None, integrator: str = None):
+    """Items de transfert archivés pour un périmètre (wallet, intégrateur) : pages crawlées pour lui
+    Les statuts (sans paramètre wallet ni intégrateur) ne s'appliquent qu'aux transferts déjà vus
+    Un item plus ancien (champ t) que le dernier émis pour le même transfert est ignoré"""
+    integrator = integrator or jv.INTEGRATOR
+    latest = {}   # Clé du transfert -> t de la réponse émise la plus récente
+    waiting = {}  # Statuts lus avant toute page du transfert (segment d'un autre processus) : clé -> (t, item)
+    for record in iter_records(directory, ("transfers", "status")):
+        t = record.get("t", 0)
+        if record["kind"] == "status":
+            item = record["body"]
+            key = item_key(item) if item.get("sending") else ""
+            if key in latest:
+                if t >= latest[key]:
+                    latest[key] = t
+                    yield item
+            elif key and t >= waiting.get(key, (t, None))[0]:
+                waiting[key] = (t, item)
+            continue
+        if not in_scope(record["params"], wallet, integrator):
+            continue
+        for item in record["body"].get("data", []):
+            key = item_key(item)
+            if t >= latest.get(key, t):
+                latest[key] = t
+                yield item
+            held = waiting.pop(key, None)
+            if held is not None and held[0] > latest[key]:
+                latest[key] = held[0]
+                yield held[1]
+
+def archived_chains(directory: str) -> dict:
+    """Liste de chaînes archivée la plus récente (champ t)"""
+    mapping, newest = {}, None
+    for record in iter_records(directory, ("chains",)):
+        if newest is None or record.get("t", 0) >= newest:
+            newest = record.get("t", 0)
+            mapping = {int(c["chainId"]): c["name"] for c in record["body"] if c.get("chainId") and c.get("name")}
+    return mapping
+
+def replay(directory: str, chain_map: dict = None, wallet: str = None, integrator: str = None) -> jv.SyncState:
+    """Rejoue l'archive d'un périmètre dans le normaliseur et l'analyseur
+    La réponse la plus récente (champ t), quel que soit son segment, fait foi"""""
+    state = jv.SyncState(wallet, chain_map if chain_map is not None else archived_chains(directory))
+    batch = []
+    for item in iter_items(directory, wallet, integrator):
+        batch.append(item)
+        if len(batch) >= 10_000:
+            state.ingest(batch)
+            batch = []
+    state.ingest(batch)
+    return state
+
+# ==================== FONCTION PRINCIPALE ====================
+def main():
+    parser = argparse.ArgumentParser(description="Rejeu hors ligne des réponses archivées")
+    parser.add_argument("--dir", default=ARCHIVE_DIR, required=ARCHIVE_DIR is None, help="Dossier de l'archive")
+    parser.add_argument("--wallet", help="Rejoue les crawls de ce wallet (défaut : crawls de tout l'intégrateur)")
+    parser.add_argument("--integrator", default=jv.INTEGRATOR, help="Intégrateur des crawls rejoués")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    state = replay(args.dir, wallet=args.wallet, integrator=args.integrator)
+    print(f"✅ {len(state.analyzer.transactions)} transactions rejouées en {time.perf_counter() - t0:.2f}s "
+          f"({len(segments(args.dir))} segment(s))")
+    if state.analyzer.transactions:
+        state.analyzer.print_results()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Client asyncio de l'API LI.FI pour les services asynchrones
+Partage avec l'API synchrone le plafond de requêtes, les disjoncteurs, le hedging, les hooks et le cache des chaînes
+aiohttp (optionnel) rend les requêtes non bloquantes ; sans lui, jv.api_get tourne dans un thread de la boucle
+"""
+import argparse
+import asyncio
+import datetime as dt
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+
+import jumper_volume as jv
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# ==================== CONFIGURATION ====================
+SLOT_WAITERS = jv.POOL_SIZE  # Threads bloqués au plus en attente d'un créneau (les autres attentes font la queue)
+
+# ==================== TRANSPORT ====================
+class AsyncResponse:
+    """Réponse lue en entier, compatible avec decode_json et les hooks de jumper_volume"""
+    def __init__(self, url: str, status_code: int, headers: dict, content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            # Même exception que requests : is_api_failure s'applique tel quel
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+_slot_executor = None
+_slot_lock = threading.Lock()
+
+def get_slot_executor() -> ThreadPoolExecutor:
+    """Pool dédié aux attentes bloquantes sur le plafond partagé"""
+    global _slot_executor
+    with _slot_lock:
+        if _slot_executor is None:
+            _slot_executor = ThreadPoolExecutor(max_workers=SLOT_WAITERS, thread_name_prefix="jumper-slots")
+        return _slot_executor
+
+async def acquire_slot():
+    """Prend un créneau du plafond global (partagé avec les threads) sans bloquer la boucle
+    L'attente se fait dans un thread, réveillé par release() : pas de sondage depuis la boucle"""
+    slots = jv.api_slots  # set_api_concurrency peut le remplacer : on libère celui qu'on a pris
+    if slots.acquire(blocking=False):
+        return slots
+    waiting = get_slot_executor().submit(slots.acquire)
+    try:
+        await asyncio.shield(asyncio.wrap_future(waiting))
+    except asyncio.CancelledError:
+        # Créneau obtenu après l'annulation : rendu par le thread, même si la boucle est déjà fermée
+        waiting.add_done_callback(lambda _: slots.release())
+        raise
+    return slots
+
+class AsyncJumperClient:
+    """Client asynchrone ; à utiliser avec `async with`, une instance par boucle d'événements"""
+    def __init__(self):
+        self.session = None
+
+    async def __aenter__(self):
+        if aiohttp is not None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=jv.POOL_SIZE),
+                timeout=aiohttp.ClientTimeout(sock_connect=jv.TIMEOUT[0], sock_read=jv.TIMEOUT[1]),
+                headers={"Accept-Encoding": jv.ACCEPT_ENCODING},
+            )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def _attempt(self, url: str, params: dict, tracker: jv.LatencyTracker) -> AsyncResponse:
+        slots = await acquire_slot()
+        try:
+            t0 = time.perf_counter()
+            query = {k: v for k, v in params.items() if v is not None}  # Comme requests
+            async with self.session.get(url, params=query) as resp:
+                r = AsyncResponse(str(resp.url), resp.status, dict(resp.headers), await resp.read())
+        finally:
+            slots.release()
+        r.raise_for_status()
+        tracker.record(time.perf_counter() - t0)
+        return r
+
+    async def get(self, url: str, params: dict = None):
+        """Équivalent asynchrone de jv.api_get : disjoncteur, couverture au-delà du p95, hooks"""
+        params = dict(params or {})
+        if self.session is None:
+            # Sans aiohttp : requête synchrone hors du pool de jv.get_executor(), où api_get soumet ses essais
+            # (l'y appeler bloquerait tous ses threads dès POOL_SIZE requêtes simultanées)
+            return await asyncio.to_thread(jv.api_get, url, params)
+
+        host = urlparse(url).netloc
+        breaker, tracker = jv.breakers[host], jv.latencies[host]
+        if not breaker.allow():
+            raise jv.CircuitOpenError(f"API {host} indisponible, nouvel essai dans {breaker.cooldown}s")
+
+        tasks = [asyncio.ensure_future(self._attempt(url, params, tracker))]
+        settled = False  # Succès ou échec enregistré auprès du disjoncteur
+        try:
+            if jv.HEDGE:
+                done, _ = await asyncio.wait(tasks, timeout=tracker.p95())
+                if not done:
+                    tasks.append(asyncio.ensure_future(self._attempt(url, params, tracker)))
+
+            error = None
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    r = await next_done
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    error = e
+                    continue
+                breaker.success()
+                settled = True
+                for hook in jv.response_hooks:
+                    try:
+                        hook(url, params, r)
+                    except Exception as e:
+                        print(f"⚠️ Erreur du hook {getattr(hook, '__qualname__', hook)}: {e}")
+                return r
+
+            if jv.is_api_failure(error):
+                breaker.failure()
+            else:
+                breaker.success()
+            settled = True
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()  # Requête perdante (ou annulation de l'appelant)
+            if not settled:
+                breaker.release()  # Sinon un essai annulé laisserait le disjoncteur bloqué en semi-ouvert
+
+    # ---------- API ----------
+    async def fetch_chains(self) -> dict:
+        """Liste des blockchains (dernière liste connue, partagée avec l'API sync, si indisponible)"""
+        try:
+            r = await self.get(jv.CHAINS_URL)
+            return jv.parse_chains(jv.decode_json(r))
+        except Exception as e:
+            print(f"❌ Erreur lors de la récupération des chaînes: {e}")
+            return dict(jv._chains_cache)
+
+    async def fetch_status(self, tx_hash: str) -> dict:
+        """État courant d'un transfert"""
+        try:
+            r = await self.get(jv.STATUS_URL, {"txHash": tx_hash})
+            return jv.decode_json(r)
+        except Exception as e:
+            print(f"❌ Erreur lors de la récupération du statut {jv.shorten_tx(tx_hash)}: {e}")
+            return {}
+
+    async def pages(self, wallet: str, from_ts: int, to_ts: int, limit: int = 200, progress: dict = None,
+                    integrator: str = None):
+        """Itérateur asynchrone des pages brutes (`async for page in client.pages(...)`)
+        Les erreurs sont propagées ; annuler la tâche consommatrice arrête le crawl"""
+        params = jv.transfer_params(wallet, from_ts, to_ts, limit, integrator)
+        progress = progress if progress is not None else jv.new_progress(from_ts, to_ts)
+        while True:
+            data = jv.decode_json(await self.get(jv.API_URL, params))
+            page = data.get("data", [])
+            jv._update_progress(progress, page)
+            yield page
+            if not data.get("hasNext"):
+                return
+            params["next"] = data.get("next")
+            await asyncio.sleep(jv.PAGE_DELAY)
+
+    async def fetch_all(self, wallet: str, from_ts: int, to_ts: int, limit: int = 200,
+                        raise_errors: bool = False, on_page=None, integrator: str = None) -> list:
+        """Équivalent asynchrone de jv.fetch_all ; on_page(items, progress) après chaque page"""
+        out = []
+        progress = jv.new_progress(from_ts, to_ts)
+        try:
+            async for page in self.pages(wallet, from_ts, to_ts, limit, progress, integrator):
+                out.extend(page)
+                if on_page is not None:
+                    on_page(page, progress)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"❌ Erreur lors de la récupération: {e}")
+            if raise_errors:
+                raise
+        return out
+
+    async def analyze(self, wallet: str, from_ts: int, to_ts: int, chain_map: dict) -> jv.TransactionAnalyzer:
+        """Récupère et analyse l'historique d'un wallet"""
+        analyzer = jv.TransactionAnalyzer()
+        async for page in self.pages(wallet, from_ts, to_ts):
+            for tx in jv.normalize_items(page, chain_map):
+                if jv.is_valid_transaction(tx):
+                    analyzer.add_transaction(tx)
+        return analyzer
+
+    async def analyze_many(self, wallets: list, from_ts: int, to_ts: int, chain_map: dict) -> dict:
+        """Analyse concurrente de plusieurs wallets sur la même boucle : wallet -> analyseur ou exception"""
+        wallets = list(dict.fromkeys(wallets))
+        results = await asyncio.gather(
+            *(self.analyze(w, from_ts, to_ts, chain_map) for w in wallets), return_exceptions=True
+        )
+        return dict(zip(wallets, results))
+
+# ==================== FONCTION PRINCIPALE ====================
+async def run(wallets: list, from_ts: int):
+    async with AsyncJumperClient() as client:
+        chain_map = await client.fetch_chains()
+        if not chain_map:
+            print("❌ Impossible de récupérer la liste des blockchains!")
+            return
+        to_ts = int(dt.datetime.now(dt.timezone.utc).timestamp())
+        t0 = time.perf_counter()
+        results = await client.analyze_many(wallets, from_ts, to_ts, chain_map)
+        for wallet, analyzer in results.items():
+            if isinstance(analyzer, BaseException):
+                print(f"❌ {wallet} : {analyzer}")
+            else:
+                print(f"✅ {wallet} : {len(analyzer.transactions)} tx • ${analyzer.total_value:,.2f}")
+        print(f"\n⏱️ {len(results)} wallet(s) en {time.perf_counter() - t0:.1f}s "
+              f"({'aiohttp' if client.session is not None else 'pool de threads'})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse asynchrone de wallets Jumper Exchange")
+    parser.add_argument("wallets", nargs="+", help="Adresses des wallets")
+    parser.add_argument("--from-date", required=True, help="Date de début (YYYY-MM-DD)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args.wallets, jv.to_unix(args.from_date)))
+    except KeyboardInterrupt:
+        print("\n⏹️ Interrompu")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Références de performance des chemins critiques, enregistrées par commit
+`record` mesure et archive, `compare` signale les régressions statistiquement significatives
+"""
+import argparse
+import contextlib
+import datetime as dt
+import io
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+import jumper_bench as jb
+import jumper_volume as jv
+
+# ==================== CONFIGURATION ====================
+BASELINE_PATH = "perf_baselines.jsonl"  # Une ligne JSON par enregistrement
+RUNS = 15                               # Échantillons par mesure
+MEMORY_RUNS = 3                         # Échantillons de mémoire (tracemalloc ralentit les mesures de temps)
+THRESHOLD = 0.05                        # Régression signalée au-delà de +5 % sur la médiane...
+ALPHA = 0.01                            # ...si le test de Mann-Whitney est significatif à ce seuil
+
+# Mesures : nom -> (description, unité) ; toutes « plus petit = meilleur »
+METRICS = {
+    "fetch_all": ("fetch_all complet contre le serveur local", "ms"),
+    "build_transaction_dict": ("build_transaction_dict par transfert", "µs"),
+    "analyze_transactions": ("analyze_transactions complet", "ms"),
+    "dataframe_csv": ("DataFrame + export CSV", "ms"),
+    "peak_memory": ("pic mémoire normalisation → CSV", "Mo"),
+}
+SCALES = {"ms": 1e3, "µs": 1e6, "Mo": 1 / 2 ** 20}
+
+# ==================== MESURES ====================
+def export_csv(transactions: list) -> bytes:
+    """Même chemin que le dashboard : DataFrame trié puis CSV"""
+    txs = sorted(transactions, key=lambda tx: tx["timestamp"], reverse=True)
+    df = pd.DataFrame(txs)
+    df["date"] = pd.to_datetime(df["timestamp"], unit="s", utc=True).dt.date
+    return df.to_csv(index=False).encode("utf-8")
+
+def pipeline(items: list, chain_map: dict):
+    """Normalisation, analyse et export d'un historique complet"""
+    analyzer = jv.TransactionAnalyzer()
+    analyzer.analyze_transactions(jv.normalize_items(items, chain_map))
+    export_csv(analyzer.transactions)
+
+def warm_measure(fn, runs: int = RUNS) -> list:
+    """jb.measure précédé d'un appel de préchauffage non mesuré (caches, connexions, allocations)"""
+    jb.measure(fn, 1)
+    return jb.measure(fn, runs)
+
+def collect(transfers: int = jb.TRANSFERS, runs: int = RUNS) -> dict:
+    """Échantillons bruts (secondes ou octets) de chaque mesure"""
+    samples = {}
+    with jb.LocalServer(jb.make_dataset(transfers)):
+        with contextlib.redirect_stdout(io.StringIO()):
+            chain_map = jv.fetch_chains()
+            items = jv.fetch_all(None, 0, 2 ** 40)
+        samples["fetch_all"] = warm_measure(lambda: jv.fetch_all(None, 0, 2 ** 40), runs)
+
+    per_row = warm_measure(lambda: [jv.build_transaction_dict(it, chain_map) for it in items], runs)
+    samples["build_transaction_dict"] = [s / len(items) for s in per_row]
+
+    transactions = jv.normalize_items(items, chain_map)
+    samples["analyze_transactions"] = warm_measure(
+        lambda: jv.TransactionAnalyzer().analyze_transactions(transactions), runs
+    )
+    samples["dataframe_csv"] = warm_measure(lambda: export_csv(transactions), runs)
+
+    peaks = []
+    for _ in range(MEMORY_RUNS):
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                pipeline(items, chain_map)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    samples["peak_memory"] = peaks
+    return samples
+
+# ==================== HISTORIQUE ====================
+def current_commit() -> tuple:
+    """(hash du commit, arbre modifié ?) ; ('unknown', True) hors dépôt git"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    capture_output=True, text=True, check=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", True
+
+def environment() -> str:
+    return f"{platform.python_implementation()} {platform.python_version()} / {platform.machine()}"
+
+def load_history(path: str = BASELINE_PATH) -> list:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+def record(samples: dict, transfers: int, path: str = BASELINE_PATH) -> dict:
+    """Ajoute un enregistrement à l'historique"""
+    commit, dirty = current_commit()
+    entry = {
+        "commit": commit,
+        "dirty": dirty,
+        "recorded_at": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "transfers": transfers,
+        "samples": samples,
+    }
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    return entry
+
+def find_baseline(history: list, commit: str = None, exclude: str = None):
+    """Dernier enregistrement propre d'un commit donné, sinon du dernier commit différent de exclude"""
+    for entry in reversed(history):
+        if entry["dirty"]:
+            continue
+        if commit is not None and entry["commit"].startswith(commit):
+            return entry
+        if commit is None and entry["commit"] != exclude:
+            return entry
+    return None
+
+# ==================== STATISTIQUES ====================
+def mann_whitney_p(base: list, new: list) -> float:
+    """p-value unilatérale (new > base) du test U de Mann-Whitney, approximation normale corrigée des ex aequo"""
+    n1, n2 = len(base), len(new)
+    if not n1 or not n2:
+        return 1.0
+    values = sorted([(v, 0) for v in base] + [(v, 1) for v in new])
+    ranks = [0.0] * len(values)
+    ties = 0.0
+    i = 0
+    while i < len(values):
+        j = i
+        while j + 1 < len(values) and values[j + 1][0] == values[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        ties += t ** 3 - t
+        i = j + 1
+    u = sum(r for r, (_, group) in zip(ranks, values) if group == 1) - n2 * (n2 + 1) / 2
+    n = n1 + n2
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1))))
+    if sigma == 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / sigma  # Correction de continuité
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def compare(base: dict, new: dict, threshold: float = THRESHOLD, alpha: float = ALPHA) -> list:
+    """Une ligne par mesure : médianes, variation relative, p-value et verdict"""
+    rows = []
+    for name in METRICS:
+        a, b = base["samples"].get(name), new["samples"].get(name)
+        if not a or not b:
+            continue
+        before, after = statistics.median(a), statistics.median(b)
+        change = (after - before) / before if before else 0.0
+        p = mann_whitney_p(a, b)
+        if name == "peak_memory":
+            # Mémoire quasi déterministe : le seuil seul fait foi
+            regressed = change > threshold
+        else:
+            regressed = change > threshold and p < alpha
+        rows.append({"metric": name, "before": before, "after": after, "change": change,
+                     "p": p, "regressed": regressed})
+    return rows
+
+def print_comparison(rows: list, base: dict, new: dict):
+    print(f"\n📊 {base['commit']} ({base['recorded_at']}) → {new['commit']}{' (modifié)' if new['dirty'] else ''}")
+    if base["environment"] != new["environment"] or base["transfers"] != new["transfers"]:
+        print(f"⚠️ Conditions différentes : {base['environment']}, {base['transfers']} transferts "
+              f"vs {new['environment']}, {new['transfers']} transferts")
+    print(f"\n   {'MESURE':<42} {'AVANT':>10} {'APRÈS':>10} {'VARIATION':>10} {'p':>8}")
+    for row in rows:
+        label, unit = METRICS[row["metric"]]
+        scale = SCALES[unit]
+        flag = "❌ RÉGRESSION" if row["regressed"] else ("✅" if row["change"] <= 0 else "")
+        print(f"   {label:<42} {row['before'] * scale:>8.2f}{unit:<2} {row['after'] * scale:>8.2f}{unit:<2} "
+              f"{row['change']:>+9.1%} {row['p']:>8.4f}  {flag}")
+
+# ==================== FONCTION PRINCIPALE ====================
+def main():
+    parser = argparse.ArgumentParser(description="Références de performance de jumper_volume, par commit")
+    parser.add_argument("command", choices=("record", "compare", "history"),
+                        help="record : mesure et enregistre ; compare : mesure et compare à une référence ; "
+                             "history : liste les enregistrements")
+    parser.add_argument("--base", help="Commit de référence (défaut : dernier commit enregistré autre que HEAD)")
+    parser.add_argument("--transfers", type=int, default=jb.TRANSFERS, help="Taille du jeu simulé")
+    parser.add_argument("--runs", type=int, default=RUNS, help="Échantillons par mesure")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Variation relative tolérée (0.05 = 5 %%)")
+    parser.add_argument("--file", default=BASELINE_PATH, help="Fichier d'historique")
+    args = parser.parse_args()
+
+    history = load_history(args.file)
+    if args.command == "history":
+        for entry in history:
+            medians = " • ".join(
+                f"{name} {statistics.median(values) * SCALES[METRICS[name][1]]:.2f}{METRICS[name][1]}"
+                for name, values in entry["samples"].items() if name in METRICS
+            )
+            print(f"{entry['commit']}{'+' if entry['dirty'] else ' '} {entry['recorded_at']}  {medians}")
+        return
+
+    commit, dirty = current_commit()
+    if args.command == "compare":
+        # Arbre modifié : la référence peut être HEAD lui-même
+        base = find_baseline(history, args.base, exclude=None if dirty else commit)
+        if base is None:
+            print("❌ Aucune référence enregistrée (lancer d'abord `record` sur le commit de référence)")
+            sys.exit(2)
+
+    print(f"⏱️ Mesures sur {args.transfers} transferts, {args.runs} échantillons...")
+    t0 = time.perf_counter()
+    samples = collect(args.transfers, args.runs)
+    print(f"   terminé en {time.perf_counter() - t0:.1f}s")
+
+    if args.command == "record":
+        entry = record(samples, args.transfers, args.file)
+        print(f"✅ Référence enregistrée pour {entry['commit']}{' (arbre modifié)' if entry['dirty'] else ''} "
+              f"dans {args.file}")
+        return
+
+    new = {"commit": commit, "dirty": dirty, "recorded_at": "", "environment": environment(),
+           "transfers": args.transfers, "samples": samples}
+    rows = compare(base, new, args.threshold)
+    print_comparison(rows, base, new)
+    regressions = [row for row in rows if row["regressed"]]
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) significative(s)")
+        sys.exit(1)
+    print("\n✅ Aucune régression significative")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analyse par lot de nombreux wallets Jumper Exchange
+Récupération concurrente (threads), normalisation + analyse en parallèle (processus)
+ou crawl unique de tout l'intégrateur, routé vers les wallets suivis, si c'est moins coûteux en requêtes
+"""
+import argparse
+import csv
+import datetime as dt
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import jumper_archive as ja
+import jumper_cohort as jc
+import jumper_preview as jp
+import jumper_volume as jv
+
+# ==================== CONFIGURATION ====================
+FETCH_WORKERS = 8                      # Wallets récupérés simultanément
+PROCESS_WORKERS = os.cpu_count() or 2  # Processus d'analyse
+PAGE_LIMIT = 200                       # Transferts par page de l'API
+SUMMARY_FIELDS = (
+    "wallet", "transactions", "bridges", "swaps", "bridge_value", "swap_value",
+    "total_value", "chains", "platforms", "top_platform", "seconds",
+)
+
+# ==================== ANALYSE D'UN WALLET ====================
+def wallet_summary(wallet: str, analyzer: jv.TransactionAnalyzer, seconds: float = 0.0) -> dict:
+    """Résumé plat d'une analyse, une ligne par wallet"""
+    top = max(analyzer.platforms.items(), key=lambda x: x[1])[0] if analyzer.platforms else ""
+    return {
+        "wallet": wallet,
+        "transactions": len(analyzer.transactions),
+        "bridges": analyzer.bridges,
+        "swaps": analyzer.swaps,
+        "bridge_value": analyzer.bridge_value,
+        "swap_value": analyzer.swap_value,
+        "total_value": analyzer.total_value,
+        "chains": len(analyzer.blockchains),
+        "platforms": len(analyzer.platforms),
+        "top_platform": top,
+        "seconds": seconds,
+        "platform_counts": dict(analyzer.platforms),
+        "chain_counts": dict(analyzer.chain_counts),
+    }
+
+def analyze_raw(wallet: str, items: list, chain_map: dict, fetch_seconds: float = 0.0) -> dict:
+    """Normalise et analyse les items bruts d'un wallet (exécuté dans un processus)"""
+    t0 = time.perf_counter()
+    analyzer = jv.TransactionAnalyzer()
+    for tx in jv.normalize_items(items, chain_map):
+        if jv.is_valid_transaction(tx):
+            analyzer.add_transaction(tx)
+    return wallet_summary(wallet, analyzer, fetch_seconds + time.perf_counter() - t0)
+
+def fetch_wallet(wallet: str, from_ts: int, to_ts: int) -> tuple:
+    """Récupère l'historique brut d'un wallet (exécuté dans un thread)"""
+    t0 = time.perf_counter()
+    items = jv.fetch_all(wallet, from_ts, to_ts, limit=200)
+    return wallet, items, time.perf_counter() - t0
+
+# ==================== LOT ====================
+def analyze_wallets(wallets: list, from_ts: int, to_ts: int, chain_map: dict,
+                    fetch_workers: int = FETCH_WORKERS, process_workers: int = PROCESS_WORKERS):
+    """Générateur : produit le résumé de chaque wallet dès qu'il est terminé"""
+    with ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="jumper-wallet") as fetchers, \
+            ProcessPoolExecutor(max_workers=process_workers) as analyzers:
+        pending = {fetchers.submit(fetch_wallet, w, from_ts, to_ts) for w in dict.fromkeys(wallets)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if isinstance(result, tuple):
+                    wallet, items, seconds = result
+                    pending.add(analyzers.submit(analyze_raw, wallet, items, chain_map, seconds))
+                else:
+                    yield result
+
+# ==================== CRAWL PARTAGÉ ====================
+def tracked_set(wallets: list) -> dict:
+    """Filtre d'appartenance : adresse en minuscules -> wallet tel que fourni"""
+    return {w.lower(): w for w in dict.fromkeys(wallets)}
+
+def analyze_shared(wallets: list, from_ts: int, to_ts: int, chain_map: dict):
+    """Générateur : un seul crawl de tout l'intégrateur, chaque transfert routé vers son expéditeur
+    et/ou son destinataire suivis ; une analyse par wallet en une seule passe, produite à la fin du crawl"""
+    tracked = tracked_set(wallets)
+    analyzers = {w: jv.TransactionAnalyzer() for w in tracked.values()}
+    t0 = time.perf_counter()
+
+    def handle(items, progress):
+        for item in items:
+            sender = tracked.get((item.get("fromAddress") or "").lower())
+            receiver = tracked.get((item.get("toAddress") or "").lower())
+            if sender is None and receiver is None:
+                continue  # Cas de loin le plus fréquent : ni normalisation ni analyse
+            try:
+                tx = jv.build_transaction_dict(item, chain_map)
+            except Exception:
+                continue
+            if not jv.is_valid_transaction(tx):
+                continue
+            if sender is not None:
+                analyzers[sender].add_transaction(tx)
+            if receiver is not None and receiver != sender:
+                analyzers[receiver].add_transaction(tx)
+
+    jv.fetch_all(None, from_ts, to_ts, limit=PAGE_LIMIT, raise_errors=True, on_page=handle)
+    seconds = time.perf_counter() - t0
+    for wallet, analyzer in analyzers.items():
+        yield wallet_summary(wallet, analyzer, seconds)
+
+def plan_crawl(wallets: list, from_ts: int, to_ts: int, chain_map: dict,
+               windows: int = jp.PREVIEW_WINDOWS, seed: int = None) -> dict:
+    """Estime le nombre de requêtes des deux stratégies par échantillonnage de fenêtres et choisit la moins chère
+    Par wallet : au moins une page chacun, plus une page par PAGE_LIMIT transferts les concernant
+    Partagé : une page par PAGE_LIMIT transferts de tout l'intégrateur"""
+    tracked = tracked_set(wallets)
+    plan = jp.plan_windows(from_ts, to_ts, windows, jp.WINDOW_SPAN, random.Random(seed))
+    with ThreadPoolExecutor(max_workers=jp.PREVIEW_THREADS, thread_name_prefix="jumper-plan") as pool:
+        samples = list(pool.map(lambda w: jp.sample_window(None, w[0], w[1], chain_map, tracked=tracked), plan))
+    estimates = jp.extrapolate(samples, [stratum for _, _, stratum in plan], ("items", "tracked"))
+    shared = max(1, math.ceil(estimates["items"][0] / PAGE_LIMIT))
+    per_wallet = len(tracked) + math.ceil(estimates["tracked"][0] / PAGE_LIMIT)
+    return {
+        "mode": "shared" if shared < per_wallet else "per-wallet",
+        "shared_requests": shared,
+        "per_wallet_requests": per_wallet,
+        "transfers": estimates["items"],
+        "tracked_transfers": estimates["tracked"],
+        "sampling_requests": len(samples),
+    }
+
+def read_wallets(path: str) -> list:
+    """Liste de wallets depuis un fichier (une adresse par ligne, # pour commenter) ou - pour stdin"""
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    wallets = [line.split("#")[0].strip() for line in lines]
+    return [w for w in wallets if w.startswith("0x")]
+
+# ==================== FONCTION PRINCIPALE ====================
+def main():
+    parser = argparse.ArgumentParser(description="Analyse par lot de wallets Jumper Exchange")
+    parser.add_argument("wallets", help="Fichier de wallets (une adresse par ligne) ou - pour stdin")
+    parser.add_argument("--from-date", required=True, help="Date de début (YYYY-MM-DD)")
+    parser.add_argument("--threads", type=int, default=FETCH_WORKERS, help="Wallets récupérés simultanément")
+    parser.add_argument("--processes", type=int, default=PROCESS_WORKERS, help="Processus d'analyse")
+    parser.add_argument("--max-requests", type=int, default=jv.API_CONCURRENCY,
+                        help="Requêtes simultanées max vers l'API")
+    parser.add_argument("--mode", choices=("auto", "per-wallet", "shared"), default="auto",
+                        help="Un crawl par wallet, un crawl partagé de tout l'intégrateur, ou choix sur estimation")
+    parser.add_argument("--csv", help="Écrit aussi le tableau récapitulatif dans ce fichier CSV")
+    parser.add_argument("--archive", metavar="DOSSIER", help="Archive les réponses brutes (rejouables hors ligne)")
+    args = parser.parse_args()
+
+    if args.archive:
+        ja.PageArchive(args.archive).attach()
+
+    # Doublons retirés une fois pour toutes (adresses insensibles à la casse) : compteurs et crawls alignés
+    wallets = list(tracked_set(read_wallets(args.wallets)).values())
+    if not wallets:
+        print("❌ Aucun wallet valide!")
+        return
+
+    chain_map = jv.fetch_chains()
+    if not chain_map:
+        print("❌ Impossible de récupérer la liste des blockchains!")
+        return
+
+    jv.set_api_concurrency(args.max_requests)
+    from_ts = jv.to_unix(args.from_date)
+    to_ts = int(dt.datetime.now(dt.timezone.utc).timestamp())
+
+    mode = args.mode
+    if mode == "auto":
+        plan = plan_crawl(wallets, from_ts, to_ts, chain_map)
+        mode = plan["mode"]
+        print(f"🧭 Estimation ({plan['sampling_requests']} requêtes d'échantillonnage) : "
+              f"~{plan['per_wallet_requests']} requêtes par wallet vs ~{plan['shared_requests']} en crawl partagé "
+              f"(~{plan['transfers'][0]:,.0f} transferts dont ~{plan['tracked_transfers'][0]:,.0f} suivis) "
+              f"→ {'crawl partagé' if mode == 'shared' else 'un crawl par wallet'}")
+    if mode == "shared":
+        rows = analyze_shared(wallets, from_ts, to_ts, chain_map)
+    else:
+        rows = analyze_wallets(wallets, from_ts, to_ts, chain_map, args.threads, args.processes)
+
+    out = open(args.csv, "w", newline="", encoding="utf-8") if args.csv else None
+    writer = csv.DictWriter(out, SUMMARY_FIELDS, extrasaction="ignore") if out else None
+    if writer:
+        writer.writeheader()
+
+    print(f"\n{'WALLET':<44} {'TX':>6} {'BRIDGES $':>14} {'SWAPS $':>14} {'CHAÎNES':>8} {'PLATEFORME':<14}")
+    cohort = jc.Cohort()
+    t0 = time.perf_counter()
+    for i, row in enumerate(rows, 1):
+        print(f"{row['wallet']:<44} {row['transactions']:>6} {row['bridge_value']:>14,.2f} "
+              f"{row['swap_value']:>14,.2f} {row['chains']:>8} {row['top_platform']:<14} [{i}/{len(wallets)}]")
+        cohort.update([row])
+        if writer:
+            writer.writerow(row)
+            out.flush()
+    if out:
+        out.close()
+    print(f"\n✅ {len(wallets)} wallet(s) analysés en {time.perf_counter() - t0:.1f}s")
+
+    print("\n🏆 TOP BRIDGE VOLUME")
+    for wallet, rank in cohort.leaderboard("bridge_value", 10).iterrows():
+        print(f"   {int(rank['rank']):>4}. {wallet}  ${rank['bridge_value']:>16,.2f}  (top {rank['top_pct']:.1f}%)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Banc d'essai local : serveur li.quest simulé et mesures des chemins critiques
+Aucun appel réseau externe, les URLs de jumper_volume sont redirigées vers 127.0.0.1
+"""
+import argparse
+import asyncio
+import contextlib
+import gzip
+import io
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import jumper_async as jasync
+import jumper_volume as jv
+
+# ==================== CONFIGURATION ====================
+TRANSFERS = 5000
+RUNS = 10
+SEED = 42
+START_TS = 1_735_689_600  # 2025-01-01
+SPAN = 180 * 86400
+CHAINS = {1: "Ethereum Mainnet", 10: "OP Mainnet", 56: "BNB Smart Chain Mainnet",
+          137: "Polygon Mainnet", 8453: "Base", 42161: "Arbitrum One"}
+PLATFORMS = ["stargateV2", "across", "relay", "mayan", "1inch", "paraswap"]
+TOKENS = [("USDC", 6, "1.0"), ("USDT", 6, "1.0"), ("ETH", 18, "3200.0"), ("WBTC", 8, "95000.0")]
+WALLETS = [f"0x{i:040x}" for i in range(1, 51)]
+ASYNC_TIMEOUT = 60  # Secondes max pour l'analyse concurrente de tous les wallets (blocage sinon)
+
+# ==================== DONNÉES SIMULÉES ====================
+def make_item(rng: random.Random, i: int, ts: int, integrator: str = None) -> dict:
+    """Construit un transfert au format de l'API analytics"""
+    s_chain, r_chain = rng.choice(list(CHAINS)), rng.choice(list(CHAINS))
+    symbol, decimals, price = rng.choice(TOKENS)
+    amount = rng.randint(10 ** (decimals - 2), 10 ** (decimals + 4))
+    wallet = rng.choice(WALLETS)
+    token = {"symbol": symbol, "decimals": decimals, "priceUSD": price,
+             "address": f"0x{abs(hash(symbol)) % 16 ** 40:040x}", "name": symbol}
+    return {
+        "transactionId": f"0x{i:064x}",
+        "status": "DONE",
+        "substatus": "COMPLETED",
+        "tool": rng.choice(PLATFORMS),
+        "integrator": integrator or jv.INTEGRATOR,
+        "fromAddress": wallet,
+        "toAddress": wallet,
+        "sending": {"txHash": f"0x{i:064x}", "chainId": s_chain, "timestamp": ts,
+                    "amount": str(amount), "amountUSD": "0", "token": dict(token, chainId=s_chain)},
+        "receiving": {"txHash": f"0x{i + 10 ** 9:064x}", "chainId": r_chain,
+                      "timestamp": ts + (rng.randint(5, 900) if s_chain != r_chain else 0),
+                      "amount": str(amount * 99 // 100), "amountUSD": "0", "token": dict(token, chainId=r_chain)},
+    }
+
+def make_dataset(n: int = TRANSFERS, seed: int = SEED, integrators: list = None) -> list:
+    """Jeu de transferts déterministe, du plus récent au plus ancien comme l'API
+    integrators : répartit les transferts entre ces intégrateurs (INTEGRATOR seul par défaut)"""
+    rng = random.Random(seed)
+    items = [
+        make_item(rng, i, START_TS + rng.randint(0, SPAN), rng.choice(integrators) if integrators else None)
+        for i in range(n)
+    ]
+    items.sort(key=lambda x: x["sending"]["timestamp"], reverse=True)
+    return items
+
+# ==================== SERVEUR LOCAL ====================
+class FakeLiQuestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # En-têtes et corps écrits séparément
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+        if self.server.handshake:
+            time.sleep(self.server.handshake)  # Coût simulé d'un handshake TCP+TLS
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.server.slow_rate and random.random() < self.server.slow_rate:
+            time.sleep(self.server.slow_delay)  # Page lente (latence de queue)
+        with self.server.lock:
+            self.server.requests += 1
+
+        if url.path.endswith("/analytics/transfers"):
+            self.send_transfers_page(query)
+        elif url.path.endswith("/status"):
+            item = self.server.by_hash.get(query.get("txHash"))
+            self.send_json(item or {"status": "NOT_FOUND"}, 200 if item else 404)
+        elif url.path.endswith("/chains.json"):
+            self.send_json([{"chainId": cid, "name": name} for cid, name in CHAINS.items()])
+        else:
+            self.send_json({"message": "not found"}, 404)
+
+    def send_transfers_page(self, query: dict):
+        """Pages encodées (et compressées) une seule fois puis resservies depuis le cache"""
+        gzipped = "gzip" in (self.headers.get("Accept-Encoding") or "")
+        key = (tuple(sorted(query.items())), gzipped)
+        with self.server.lock:
+            body = self.server.pages.get(key)
+        if body is None:
+            body = json.dumps(self.transfers_page(query)).encode("utf-8")
+            if gzipped:
+                body = gzip.compress(body, compresslevel=5)
+            with self.server.lock:
+                self.server.pages[key] = body
+        self.send_body(body, 200, gzipped)
+
+    def transfers_page(self, query: dict) -> dict:
+        key = (query.get("wallet"), query.get("fromTimestamp"), query.get("toTimestamp"),
+               query.get("status", "ALL"), query.get("integrator"))
+        with self.server.lock:
+            matches = self.server.cache.get(key)
+        if matches is None:
+            wallet = (query.get("wallet") or "").lower()
+            from_ts = int(query.get("fromTimestamp") or 0)
+            to_ts = int(query.get("toTimestamp") or 2 ** 40)
+            status = query.get("status", "ALL")
+            matches = [
+                it for it in self.server.dataset
+                if from_ts <= it["sending"]["timestamp"] <= to_ts
+                and (not wallet or wallet in (it["fromAddress"], it["toAddress"]))
+                and (status == "ALL" or it["status"] == status)
+                and (not query.get("integrator") or it["integrator"] == query["integrator"])
+            ]
+            with self.server.lock:
+                self.server.cache[key] = matches
+        offset = int(query.get("next") or 0)
+        limit = int(query.get("limit") or 200)
+        page = matches[offset:offset + limit]
+        has_next = offset + limit < len(matches)
+        return {"data": page, "hasNext": has_next, "next": str(offset + limit) if has_next else None}
+
+    def send_json(self, payload, code: int = 200):
+        body = json.dumps(payload).encode("utf-8")
+        gzipped = "gzip" in (self.headers.get("Accept-Encoding") or "") and len(body) > 1024
+        if gzipped:
+            body = gzip.compress(body, compresslevel=5)
+        self.send_body(body, code, gzipped)
+
+    def send_body(self, body: bytes, code: int, gzipped: bool):
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(body)
+
+class FakeLiQuestServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Connexions fermées par le client (annulation, fin de session) : pas une erreur du serveur
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+class LocalServer:
+    """Serveur li.quest simulé ; en contexte, redirige les URLs de jumper_volume vers lui"""
+    def __init__(self, dataset: list = None, latency: float = 0.0, handshake: float = 0.0,
+                 slow_rate: float = 0.0, slow_delay: float = 1.0):
+        self.httpd = FakeLiQuestServer(("127.0.0.1", 0), FakeLiQuestHandler)
+        self.httpd.dataset = dataset if dataset is not None else make_dataset()
+        self.httpd.by_hash = {it["sending"]["txHash"]: it for it in self.httpd.dataset}
+        self.httpd.latency = latency
+        self.httpd.handshake = handshake
+        self.httpd.slow_rate = slow_rate
+        self.httpd.slow_delay = slow_delay
+        self.httpd.lock = threading.Lock()
+        self.httpd.cache = {}
+        self.httpd.pages = {}
+        self.httpd.connections = 0
+        self.httpd.requests = 0
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._saved = {}
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        for name, value in (("API_URL", f"{self.url}/v2/analytics/transfers"),
+                            ("STATUS_URL", f"{self.url}/v1/status"),
+                            ("CHAINS_URL", f"{self.url}/chains.json"),
+                            ("PAGE_DELAY", 0)):
+            self._saved[name] = getattr(jv, name)
+            setattr(jv, name, value)
+        jv.reset_session()
+        return self
+
+    def __exit__(self, *exc):
+        for name, value in self._saved.items():
+            setattr(jv, name, value)
+        jv.reset_session()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def counters(self) -> tuple:
+        return self.httpd.connections, self.httpd.requests
+
+# ==================== MESURES ====================
+def measure(fn, runs: int = RUNS) -> list:
+    """Durées (secondes) de runs appels successifs, sorties console de jumper_volume masquées"""
+    samples = []
+    for _ in range(runs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - t0)
+    return samples
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def report(name: str, samples: list, extra: str = ""):
+    print(f"   • {name:<34} médiane {statistics.median(samples) * 1000:8.1f} ms"
+          f" | p95 {percentile(samples, 95) * 1000:8.1f} ms {extra}")
+
+def bench_transport(server: LocalServer, runs: int = RUNS):
+    """Session neuve à chaque analyse vs transport partagé (keep-alive + pool)"""
+    print("\n🔌 TRANSPORT (fetch_chains + fetch_all complet)")
+
+    def analysis():
+        jv.fetch_chains()
+        jv.fetch_all(None, 0, 2 ** 40)
+
+    for label, reset in (("session neuve par appel", True), ("transport partagé", False)):
+        conns, reqs = server.counters()
+
+        def run():
+            if reset:
+                jv.reset_session()
+            analysis()
+
+        samples = measure(run, runs)
+        new_conns, new_reqs = server.counters()
+        report(label, samples, f"| {new_conns - conns} connexion(s) / {new_reqs - reqs} requêtes")
+
+def bench_decode(server: LocalServer, runs: int = RUNS):
+    """r.json() vs décodage direct des octets (orjson si disponible)"""
+    print(f"\n🧩 DÉCODAGE JSON (pages de 200, {jv.json_loads.__module__}.{jv.json_loads.__name__})")
+    session = jv.get_session()
+    pages = []
+    params = {"fromTimestamp": 0, "toTimestamp": 2 ** 40, "limit": 200}
+    while True:
+        r = session.get(jv.API_URL, params=params, timeout=jv.TIMEOUT)
+        pages.append(r)
+        data = jv.decode_json(r)
+        if not data.get("hasNext"):
+            break
+        params["next"] = data["next"]
+
+    report("r.json()", measure(lambda: [r.json() for r in pages], runs), f"| {len(pages)} pages")
+    report("decode_json()", measure(lambda: [jv.decode_json(r) for r in pages], runs), f"| {len(pages)} pages")
+
+def bench_hedging(server: LocalServer, runs: int = RUNS, slow_rate: float = 0.02):
+    """Latence de queue d'un crawl complet avec et sans requêtes de couverture"""
+    print(f"\n🛡️ HEDGING ({slow_rate:.0%} de pages lentes de {server.httpd.slow_delay:.1f}s)")
+    saved_hedge, saved_rate = jv.HEDGE, server.httpd.slow_rate
+    server.httpd.slow_rate = slow_rate
+    try:
+        for label, hedge in (("sans couverture", False), ("avec couverture (p95)", True)):
+            jv.HEDGE = hedge
+            jv.latencies.clear()
+            measure(lambda: jv.fetch_all(None, 0, 2 ** 40), 1)  # Préchauffage du p95
+            conns, reqs = server.counters()
+            samples = measure(lambda: jv.fetch_all(None, 0, 2 ** 40), runs)
+            report(label, samples, f"| p99 {percentile(samples, 99) * 1000:8.1f} ms | "
+                                   f"{server.counters()[1] - reqs} requêtes")
+    finally:
+        jv.HEDGE, server.httpd.slow_rate = saved_hedge, saved_rate
+
+def bench_async(server: LocalServer, wallets: list = WALLETS, timeout: float = ASYNC_TIMEOUT) -> bool:
+    """analyze_many sur plus de POOL_SIZE wallets, avec aiohttp (si installé) et avec le repli par threads
+    Renvoie False si un mode bloque ou échoue"""
+    print(f"\n⚡ ASYNC ({len(wallets)} wallets simultanés, pool de {jv.POOL_SIZE} threads)")
+    chain_map = dict(CHAINS)
+    modes = [("repli threads", True)] + ([("aiohttp", False)] if jasync.aiohttp is not None else [])
+    ok = True
+
+    async def analyze(fallback: bool) -> dict:
+        async with jasync.AsyncJumperClient() as client:
+            if fallback:
+                await client.close()  # Sans session aiohttp : chemin du repli par threads
+            return await asyncio.wait_for(client.analyze_many(wallets, 0, 2 ** 40, chain_map), timeout)
+
+    for label, fallback in modes:
+        reqs = server.counters()[1]
+        t0 = time.perf_counter()
+        try:
+            results = asyncio.run(analyze(fallback))
+        except asyncio.TimeoutError:
+            print(f"   ❌ {label:<32} bloqué au-delà de {timeout:.0f}s")
+            ok = False
+            continue
+        failed = [r for r in results.values() if isinstance(r, BaseException)]
+        ok = ok and not failed
+        total = sum(len(a.transactions) for a in results.values() if not isinstance(a, BaseException))
+        print(f"   {'❌' if failed else '✅'} {label:<32} {(time.perf_counter() - t0) * 1000:8.1f} ms"
+              f" | {total} tx | {server.counters()[1] - reqs} requêtes | {len(failed)} échec(s)")
+    return ok
+
+# ==================== FONCTION PRINCIPALE ====================
+def main():
+    parser = argparse.ArgumentParser(description="Banc d'essai local de jumper_volume")
+    parser.add_argument("--transfers", type=int, default=TRANSFERS, help="Taille du jeu simulé")
+    parser.add_argument("--runs", type=int, default=RUNS, help="Répétitions par mesure")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latence ajoutée par requête (secondes)")
+    parser.add_argument("--handshake", type=float, default=0.05, help="Coût simulé d'une nouvelle connexion (secondes)")
+    args = parser.parse_args()
+
+    with LocalServer(make_dataset(args.transfers), latency=args.latency, handshake=args.handshake) as server:
+        print(f"🧪 Serveur simulé {server.url} • {args.transfers} transferts • {args.runs} runs")
+        bench_transport(server, args.runs)
+        bench_decode(server, args.runs)
+        bench_hedging(server, args.runs)
+        if not bench_async(server):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Classements et percentiles d'une cohorte de wallets Jumper Exchange
+Calculs colonnes (pandas) sur les résumés de TransactionAnalyzer, mis à jour wallet par wallet
+"""
+import argparse
+
+import pandas as pd
+
+import jumper_store as js
+
+# ==================== CONFIGURATION ====================
+METRICS = {
+    "bridge_value": "bridge volume",
+    "swap_value": "swap volume",
+    "chains": "chains used",
+    "platforms": "platform diversity",
+}
+COHORT_MIN_SIZE = 20  # En dessous, un percentile n'a pas grand sens
+
+# ==================== COHORTE ====================
+class Cohort:
+    """Table wallet × métriques ; rangs et percentiles recalculés en bloc à la demande"""
+    def __init__(self):
+        self.frame = pd.DataFrame(columns=list(METRICS), dtype="float64")
+        self.frame.index.name = "wallet"
+        self._ranks = None
+
+    def __len__(self):
+        return len(self.frame)
+
+    def update(self, rows: list):
+        """Insère ou remplace les wallets re-synchronisés (résumés jumper_batch.wallet_summary ou rollups du cache)"""
+        rows = list(rows)
+        if not rows:
+            return
+        incoming = pd.DataFrame(rows).drop_duplicates("wallet", keep="last")
+        incoming["wallet"] = incoming["wallet"].str.lower()
+        incoming = incoming.set_index("wallet")[list(METRICS)].astype("float64")
+        self.frame = pd.concat([self.frame.drop(incoming.index, errors="ignore"), incoming])
+        self._ranks = None
+
+    def remove(self, wallets: list):
+        self.frame = self.frame.drop([w.lower() for w in wallets], errors="ignore")
+        self._ranks = None
+
+    def ranks(self) -> pd.DataFrame:
+        """Rang (1 = meilleur) et part de la cohorte au-dessus ou à égalité, par métrique"""
+        if self._ranks is None:
+            n = len(self.frame)
+            rank = self.frame.rank(ascending=False, method="min")
+            top_pct = rank.div(max(n, 1)).mul(100)
+            self._ranks = pd.concat(
+                {"value": self.frame, "rank": rank, "top_pct": top_pct, "percentile": 100 - top_pct},
+                axis=1,
+            )
+        return self._ranks
+
+    def leaderboard(self, metric: str = "bridge_value", n: int = 10) -> pd.DataFrame:
+        """Les n premiers wallets sur une métrique"""
+        ranks = self.ranks()
+        board = pd.DataFrame({
+            "rank": ranks[("rank", metric)],
+            metric: ranks[("value", metric)],
+            "top_pct": ranks[("top_pct", metric)],
+        })
+        return board.sort_values("rank").head(n)
+
+    def standing(self, wallet: str) -> dict:
+        """Position d'un wallet sur chaque métrique ({} s'il n'est pas dans la cohorte)"""
+        wallet = wallet.lower()
+        ranks = self.ranks()
+        if wallet not in ranks.index:
+            return {}
+        row = ranks.loc[wallet]
+        return {
+            metric: {
+                "label": label,
+                "value": float(row[("value", metric)]),
+                "rank": int(row[("rank", metric)]),
+                "top_pct": float(row[("top_pct", metric)]),
+                "percentile": float(row[("percentile", metric)]),
+                "cohort": len(ranks),
+            }
+            for metric, label in METRICS.items()
+        }
+
+def from_store(store: js.TransferStore, **filters) -> Cohort:
+    """Cohorte de tous les wallets présents dans le cache local"""
+    cohort = Cohort()
+    cohort.update(store.wallet_rollups(**filters))
+    return cohort
+
+def top_label(rank: dict) -> str:
+    """Ex : « top 3% bridge volume »"""
+    pct = rank["top_pct"]
+    return f"top {pct:.0f}% {rank['label']}" if pct >= 1 else f"top {pct:.1f}% {rank['label']}"
+
+# ==================== FONCTION PRINCIPALE ====================
+def main():
+    parser = argparse.ArgumentParser(description="Classement des wallets présents dans le cache local")
+    parser.add_argument("--metric", choices=list(METRICS), default="bridge_value")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--wallet", help="Affiche la position de ce wallet")
+    parser.add_argument("--store", default=js.STORE_PATH, help="Chemin de la base SQLite")
+    args = parser.parse_args()
+
+    cohort = from_store(js.TransferStore(args.store))
+    print(f"\n🏆 CLASSEMENT {METRICS[args.metric].upper()} ({len(cohort)} wallets)")
+    for wallet, row in cohort.leaderboard(args.metric, args.top).iterrows():
+        print(f"   {int(row['rank']):>4}. {wallet}  {row[args.metric]:>16,.2f}  (top {row['top_pct']:.1f}%)")
+
+    if args.wallet:
+        standing = cohort.standing(args.wallet)
+        if not standing:
+            print(f"\n❌ {args.wallet} absent de la cohorte")
+            return
+        print(f"\n📍 {args.wallet}")
+        for rank in standing.values():
+            print(f"   • #{rank['rank']} • {top_label(rank)} ({rank['value']:,.2f})")
+
+if __name__ == "__main__":
+    main()
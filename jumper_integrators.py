@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Comparaison de plusieurs intégrateurs LI.FI en une seule exécution
+Récupération concurrente (transport, plafond de requêtes et cache partagés), agrégation en une seule passe
+"""
+import argparse
+import datetime as dt
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import jumper_store as js
+import jumper_volume as jv
+
+# ==================== CONFIGURATION ====================
+FETCH_WORKERS = 4  # Intégrateurs récupérés simultanément
+
+# ==================== AGRÉGATION ====================
+class IntegratorComparison:
+    """Analyse globale et une analyse par intégrateur, alimentées par la même passe"""
+    def __init__(self):
+        self.overall = jv.TransactionAnalyzer()
+        self.by_integrator = {}  # intégrateur -> TransactionAnalyzer
+
+    def add(self, integrator: str, tx: dict):
+        self.overall.add_transaction(tx)
+        analyzer = self.by_integrator.get(integrator)
+        if analyzer is None:
+            analyzer = self.by_integrator[integrator] = jv.TransactionAnalyzer()
+        analyzer.add_transaction(tx)
+
+    def add_transactions(self, integrator: str, transactions: list) -> int:
+        """Intègre les transactions valides d'un intégrateur ; renvoie le nombre retenu"""
+        self.by_integrator.setdefault(integrator, jv.TransactionAnalyzer())
+        added = 0
+        for tx in transactions:
+            if jv.is_valid_transaction(tx):
+                self.add(integrator, tx)
+                added += 1
+        return added
+
+    def rows(self) -> list:
+        """Une ligne comparative par intégrateur, par volume décroissant"""
+        total = self.overall.total_value or 1.0
+        rows = []
+        for integrator, a in self.by_integrator.items():
+            top = max(a.platforms.items(), key=lambda x: x[1])[0] if a.platforms else ""
+            rows.append({
+                "integrator": integrator,
+                "transactions": len(a.transactions),
+                "bridges": a.bridges,
+                "swaps": a.swaps,
+                "bridge_value": a.bridge_value,
+                "swap_value": a.swap_value,
+                "total_value": a.total_value,
+                "volume_share": a.total_value / total,
+                "chains": len(a.blockchains),
+                "top_platform": top,
+                "median_size": a.sizes.quantile(0.5) if a.sizes.count > 0 else None,
+                "median_latency": a.latencies.quantile(0.5) if a.latencies.count > 0 else None,
+            })
+        return sorted(rows, key=lambda r: r["total_value"], reverse=True)
+
+    def print_results(self):
+        print("\n" + "=" * 100)
+        print("📊 COMPARAISON DES INTÉGRATEURS")
+        print("=" * 100)
+        print(f"{'INTÉGRATEUR':<22} {'TX':>7} {'BRIDGES':>8} {'SWAPS':>7} {'VOLUME $':>16} {'PART':>7} "
+              f"{'CHAÎNES':>8} {'MÉDIANE $':>12} {'RÈGLEMENT':>11}  PLATEFORME")
+        for row in self.rows():
+            size = jv.usd_fmt(row["median_size"]) if row["median_size"] is not None else "-"
+            latency = jv.duration_fmt(row["median_latency"]) if row["median_latency"] is not None else "-"
+            print(f"{row['integrator']:<22} {row['transactions']:>7} {row['bridges']:>8} {row['swaps']:>7} "
+                  f"{row['total_value']:>16,.2f} {row['volume_share']:>7.1%} {row['chains']:>8} "
+                  f"{size:>12} {latency:>11}  {row['top_platform']}")
+        print(f"{'TOTAL':<22} {len(self.overall.transactions):>7} {self.overall.bridges:>8} "
+              f"{self.overall.swaps:>7} {self.overall.total_value:>16,.2f}")
+        print("=" * 100 + "\n")
+
+# ==================== RÉCUPÉRATION ====================
+def fetch_integrator(integrator: str, wallet, from_ts: int, to_ts: int, chain_map: dict,
+                     store: js.TransferStore = None) -> list:
+    """Transactions normalisées d'un intégrateur (via le cache local s'il est fourni)"""
+    if store is not None:
+        store.sync(wallet, chain_map, from_ts, to_ts, integrator=integrator)
+        return store.query(wallet, integrator=integrator, start=from_ts, end=to_ts)
+    items = jv.fetch_all(wallet, from_ts, to_ts, limit=200, raise_errors=True, integrator=integrator)
+    return jv.normalize_items(items, chain_map)
+
+def compare_integrators(integrators: list, wallet, from_ts: int, to_ts: int, chain_map: dict,
+                        store: js.TransferStore = None, workers: int = FETCH_WORKERS) -> tuple:
+    """Récupère les intégrateurs en parallèle et les agrège au fil de l'eau : (comparaison, erreurs)"""
+    comparison = IntegratorComparison()
+    errors = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jumper-integrator") as pool:
+        futures = {
+            pool.submit(fetch_integrator, integrator, wallet, from_ts, to_ts, chain_map, store): integrator
+            for integrator in dict.fromkeys(integrators)
+        }
+        for future in as_completed(futures):
+            integrator = futures[future]
+            try:
+                comparison.add_transactions(integrator, future.result())
+            except Exception as e:
+                errors[integrator] = e
+    return comparison, errors
+
+# ==================== FONCTION PRINCIPALE ====================
+def main():
+    parser = argparse.ArgumentParser(description="Comparaison de plusieurs intégrateurs LI.FI")
+    parser.add_argument("integrators", nargs="+", help="Intégrateurs à comparer (ex. jumper.exchange)")
+    parser.add_argument("--from-date", required=True, help="Date de début (YYYY-MM-DD)")
+    parser.add_argument("--wallet", help="Restreint la comparaison à un wallet")
+    parser.add_argument("--threads", type=int, default=FETCH_WORKERS, help="Intégrateurs récupérés simultanément")
+    parser.add_argument("--max-requests", type=int, default=jv.API_CONCURRENCY,
+                        help="Requêtes simultanées max vers l'API, tous intégrateurs confondus")
+    parser.add_argument("--store", nargs="?", const=js.STORE_PATH,
+                        help="Passe par le cache SQLite local (chemin optionnel)")
+    args = parser.parse_args()
+
+    chain_map = jv.fetch_chains()
+    if not chain_map:
+        print("❌ Impossible de récupérer la liste des blockchains!")
+        return
+
+    jv.set_api_concurrency(args.max_requests)
+    store = js.TransferStore(args.store) if args.store else None
+    from_ts = jv.to_unix(args.from_date)
+    to_ts = int(dt.datetime.now(dt.timezone.utc).timestamp())
+
+    t0 = time.perf_counter()
+    comparison, errors = compare_integrators(args.integrators, args.wallet, from_ts, to_ts, chain_map,
+                                             store, args.threads)
+    print(f"\n✅ {len(args.integrators)} intégrateur(s) en {time.perf_counter() - t0:.1f}s")
+    for integrator, error in errors.items():
+        print(f"❌ {integrator} : {error}")
+    comparison.print_results()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de charge multi-utilisateurs du dashboard Streamlit
+Un vrai serveur `streamlit run` est piloté par N sessions websocket simultanées qui soumettent
+le formulaire, l'API li.quest étant remplacée par le serveur local de jumper_bench
+Nécessite le paquet websockets (installé avec les versions récentes de Streamlit)
+"""
+import argparse
+import asyncio
+import contextlib
+import datetime as dt
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+import jumper_bench as jb
+
+# ==================== CONFIGURATION ====================
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streamlit_app.py")
+LEVELS = (1, 2, 4, 8, 16)      # Sessions simultanées testées
+SESSIONS_PER_USER = 3          # Soumissions par utilisateur simulé et par palier
+SESSION_TIMEOUT = 120          # Secondes max pour une soumission
+SATURATION_GAIN = 0.10         # Palier saturé si le débit progresse de moins de 10 %
+MEMORY_SESSIONS = 8            # Sessions laissées ouvertes pour mesurer la mémoire par session
+STARTUP_TIMEOUT = 60           # Secondes max pour le démarrage du serveur Streamlit
+
+# Script lancé par `streamlit run` : redirige jumper_volume vers le serveur simulé puis exécute le dashboard
+LAUNCHER = """
+import runpy, sys
+sys.path.insert(0, {package!r})
+import jumper_volume as jv
+jv.API_URL = {url!r} + "/v2/analytics/transfers"
+jv.STATUS_URL = {url!r} + "/v1/status"
+jv.CHAINS_URL = {url!r} + "/chains.json"
+runpy.run_path({app!r}, run_name="__main__")
+"""
+
+# ==================== SERVEUR STREAMLIT ====================
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def rss_bytes(pid: int) -> int:
+    """Mémoire résidente d'un processus (Linux, /proc)"""
+    with open(f"/proc/{pid}/status", encoding="ascii") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+@contextlib.contextmanager
+def streamlit_server(api_url: str):
+    """Serveur Streamlit neuf (cache SQLite vide, caches froids) dans un dossier temporaire"""
+    with tempfile.TemporaryDirectory(prefix="jumper-load-") as tmp:
+        launcher = os.path.join(tmp, "launcher.py")
+        with open(launcher, "w", encoding="utf-8") as f:
+            f.write(LAUNCHER.format(package=os.path.dirname(APP_PATH), url=api_url, app=APP_PATH))
+        # Les fichiers statiques sont servis depuis le dossier du script lancé
+        os.symlink(os.path.join(os.path.dirname(APP_PATH), "static"), os.path.join(tmp, "static"))
+        port = free_port()
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", launcher, "--server.headless=true",
+             f"--server.port={port}", "--server.address=127.0.0.1", "--server.enableXsrfProtection=false",
+             "--browser.gatherUsageStats=false", "--server.fileWatcherType=none",
+             "--server.enableStaticServing=true"],
+            cwd=tmp, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            deadline = time.monotonic() + STARTUP_TIMEOUT
+            while True:
+                try:
+                    if requests.get(f"http://127.0.0.1:{port}/_stcore/health", timeout=1).ok:
+                        break
+                except requests.RequestException:
+                    pass
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("Le serveur Streamlit n'a pas démarré")
+                time.sleep(0.2)
+            yield f"ws://127.0.0.1:{port}/_stcore/stream", proc
+        finally:
+            proc.terminate()
+            proc.wait(10)
+
+# ==================== SESSION SIMULÉE ====================
+def rerun_message(widgets: dict = None, wallet: str = "", since: dt.date = None) -> bytes:
+    """BackMsg de rerun ; avec les ids du formulaire, le soumet comme un clic sur Analyze"""
+    msg = BackMsg()
+    msg.rerun_script.query_string = ""
+    if widgets:
+        states = msg.rerun_script.widget_states.widgets
+        state = states.add()
+        state.id, state.string_value = widgets["text_input"], wallet
+        state = states.add()
+        state.id = widgets["date_input"]
+        state.string_array_value.data.append(since.strftime("%Y/%m/%d"))
+        state = states.add()
+        state.id, state.trigger_value = widgets["button"], True
+    return msg.SerializeToString()
+
+async def until_finished(ws, on_element=None):
+    """Lit les messages jusqu'à la fin du run ; on_element(element) pour chaque nouvel élément"""
+    while True:
+        msg = ForwardMsg()
+        msg.ParseFromString(await ws.recv())
+        kind = msg.WhichOneof("type")
+        if kind == "delta" and msg.delta.WhichOneof("type") == "new_element" and on_element is not None:
+            on_element(msg.delta.new_element)
+        elif kind == "script_finished":
+            return msg.script_finished
+
+async def run_session(url: str, wallet: str, since: dt.date, keep_open: list = None) -> tuple:
+    """Ouvre le dashboard et soumet le formulaire : (secondes jusqu'aux premiers KPI, jusqu'à la fin du rendu)
+    Les premiers KPI sont ceux affichés pendant le crawl, dès la première page reçue"""
+    ws = await websockets.connect(url, subprotocols=["streamlit"], max_size=None)
+    try:
+        widgets = {}
+
+        def find_form(element):
+            kind = element.WhichOneof("type")
+            if kind in ("text_input", "date_input", "button"):
+                widgets.setdefault(kind, getattr(element, kind).id)
+
+        await ws.send(rerun_message())
+        await until_finished(ws, find_form)
+
+        kpis_at = None
+        t0 = time.perf_counter()
+
+        def find_kpis(element):
+            nonlocal kpis_at
+            if kpis_at is None and element.WhichOneof("type") == "markdown" and "kpi-value" in element.markdown.body:
+                kpis_at = time.perf_counter() - t0
+
+        await ws.send(rerun_message(widgets, wallet, since))
+        await until_finished(ws, find_kpis)
+        done_at = time.perf_counter() - t0
+        if kpis_at is None:
+            raise RuntimeError("KPI jamais affichés")
+        return kpis_at, done_at
+    finally:
+        if keep_open is None:
+            await ws.close()
+        else:
+            keep_open.append(ws)
+
+async def timed_session(url: str, wallet: str, since: dt.date):
+    """(KPI, fin) ou None en cas d'erreur ou de dépassement de délai"""
+    try:
+        return await asyncio.wait_for(run_session(url, wallet, since), SESSION_TIMEOUT)
+    except Exception:
+        return None
+
+async def simulated_user(url: str, wallets: list, since: dt.date) -> list:
+    """Un utilisateur : soumissions successives, chacune dans une nouvelle session"""
+    return [await timed_session(url, wallet, since) for wallet in wallets]
+
+# ==================== PALIERS ====================
+def run_level(api_url: str, users: int, since: dt.date, sessions_per_user: int = SESSIONS_PER_USER) -> dict:
+    """users utilisateurs simultanés contre un serveur neuf, chacun sur des wallets distincts"""
+    total = users * sessions_per_user
+    wallets = [jb.WALLETS[i % len(jb.WALLETS)] for i in range(total)]
+
+    async def level(url):
+        per_user = [wallets[u::users] for u in range(users)]
+        results = await asyncio.gather(*(simulated_user(url, w, since) for w in per_user))
+        return [r for user in results for r in user]
+
+    with streamlit_server(api_url) as (url, _):
+        t0 = time.perf_counter()
+        runs = asyncio.run(level(url))
+        wall = time.perf_counter() - t0
+
+    ok = [r for r in runs if r is not None]
+    kpis = [r[0] for r in ok]
+    return {
+        "users": users,
+        "sessions": total,
+        "errors": total - len(ok),
+        "throughput": len(ok) / wall,
+        "p50": jb.percentile(kpis, 50) if kpis else float("nan"),
+        "p99": jb.percentile(kpis, 99) if kpis else float("nan"),
+        "p99_done": jb.percentile([r[1] for r in ok], 99) if ok else float("nan"),
+    }
+
+def session_memory(api_url: str, since: dt.date, sessions: int = MEMORY_SESSIONS) -> float:
+    """Mémoire résidente du serveur par session ouverte (octets), résultats conservés dans son état"""
+    async def measure(url, pid):
+        await run_session(url, jb.WALLETS[0], since)  # Préchauffage : imports, caches partagés, thème
+        base = rss_bytes(pid)
+        kept = []
+        try:
+            for i in range(sessions):
+                await run_session(url, jb.WALLETS[1 + i], since, keep_open=kept)
+            return (rss_bytes(pid) - base) / sessions
+        finally:
+            for ws in kept:
+                await ws.close()
+
+    with streamlit_server(api_url) as (url, proc):
+        return asyncio.run(measure(url, proc.pid))
+
+def saturation_point(rows: list):
+    """Dernier palier avant que le débit cesse de progresser (ou que des erreurs apparaissent)"""
+    for previous, row in zip(rows, rows[1:]):
+        if row["errors"] or row["throughput"] < previous["throughput"] * (1 + SATURATION_GAIN):
+            return previous["users"]
+    return None
+
+# ==================== FONCTION PRINCIPALE ====================
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge multi-utilisateurs du dashboard Streamlit")
+    parser.add_argument("--levels", default=",".join(map(str, LEVELS)),
+                        help="Paliers d'utilisateurs simultanés, séparés par des virgules")
+    parser.add_argument("--sessions", type=int, default=SESSIONS_PER_USER, help="Soumissions par utilisateur et palier")
+    parser.add_argument("--transfers", type=int, default=jb.TRANSFERS, help="Taille du jeu simulé")
+    parser.add_argument("--latency", type=float, default=0.02, help="Latence ajoutée par requête API (secondes)")
+    args = parser.parse_args()
+
+    levels = sorted({int(x) for x in args.levels.split(",") if x.strip()})
+    since = dt.datetime.fromtimestamp(jb.START_TS, tz=dt.timezone.utc).date()
+
+    with jb.LocalServer(jb.make_dataset(args.transfers), latency=args.latency) as api:
+        print(f"🧪 API simulée {api.url} • {args.transfers} transferts • {len(jb.WALLETS)} wallets • "
+              f"latence {args.latency * 1000:.0f} ms")
+
+        per_session = session_memory(api.url, since)
+        print(f"💾 Mémoire du serveur par session ouverte : {per_session / 2 ** 20:.2f} Mo")
+
+        print(f"\n{'USERS':>6} {'ANALYSES':>9} {'ERREURS':>8} {'DÉBIT':>10} {'p50 KPI':>10} {'p99 KPI':>10} "
+              f"{'p99 RENDU':>10}")
+        rows = []
+        for users in levels:
+            row = run_level(api.url, users, since, args.sessions)
+            rows.append(row)
+            print(f"{row['users']:>6} {row['sessions']:>9} {row['errors']:>8} {row['throughput']:>8.2f}/s "
+                  f"{row['p50'] * 1000:>8.0f}ms {row['p99'] * 1000:>8.0f}ms {row['p99_done'] * 1000:>8.0f}ms",
+                  flush=True)
+
+    saturated = saturation_point(rows)
+    peak = max(rows, key=lambda r: r["throughput"])
+    print(f"\n📈 Débit max : {peak['throughput']:.2f} analyses/s avec {peak['users']} utilisateur(s) simultané(s)")
+    if saturated is not None:
+        print(f"⚠️ Saturation au-delà de {saturated} utilisateur(s) simultané(s) par processus Streamlit")
+    else:
+        print("✅ Pas de saturation observée sur les paliers testés")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Aperçu rapide par échantillonnage de fenêtres temporelles
+Quelques fenêtres courtes réparties sur la période sont lues en parallèle et extrapolées (intervalles de confiance)
+pendant que le crawl exact continue en arrière-plan et remplace l'estimation à la fin
+"""
+import argparse
+import datetime as dt
+import math
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import jumper_volume as jv
+
+# ==================== CONFIGURATION ====================
+PREVIEW_WINDOWS = 16      # Fenêtres échantillonnées (une par strate de même durée)
+WINDOW_SPAN = 6 * 3600    # Durée max d'une fenêtre (secondes)
+PREVIEW_LIMIT = 200       # Une seule page lue par fenêtre
+PREVIEW_THREADS = 8       # Fenêtres lues simultanément (le plafond global de l'API s'applique)
+
+# Quantiles de Student à 95 % (bilatéral) selon les degrés de liberté ; 1.96 au-delà
+T_95 = {1: 12.71, 2: 4.30, 3: 3.18, 4: 2.78, 5: 2.57, 6: 2.45, 7: 2.36, 8: 2.31, 9: 2.26, 10: 2.23,
+        11: 2.20, 12: 2.18, 13: 2.16, 14: 2.14, 15: 2.13, 20: 2.09, 30: 2.04}
+
+METRICS = ("transactions", "bridge_value", "swap_value")
+
+# ==================== ÉCHANTILLONNAGE ====================
+def t_critical(df: int) -> float:
+    """Quantile de Student à 95 % (table arrondie vers le haut entre deux entrées)"""
+    for k in sorted(T_95):
+        if df <= k:
+            return T_95[k]
+    return 1.96
+
+def plan_windows(from_ts: int, to_ts: int, windows: int = PREVIEW_WINDOWS, span: int = WINDOW_SPAN,
+                 rng: random.Random = None) -> list:
+    """Strates de même durée, une fenêtre placée au hasard dans chacune : [(début, fin, durée de la strate)]"""
+    rng = rng or random.Random()
+    total = max(1, to_ts - from_ts)
+    windows = max(1, min(windows, total))
+    stratum = total / windows
+    width = min(span, stratum)
+    plan = []
+    for k in range(windows):
+        lo = from_ts + k * stratum
+        start = lo + rng.random() * (stratum - width)
+        plan.append((int(start), int(start + width), stratum))
+    return plan
+
+def sample_window(wallet, lo: int, hi: int, chain_map: dict, integrator: str = None, tracked=None) -> dict:
+    """Première page d'une fenêtre : totaux observés et durée effectivement couverte
+    Si la page est pleine, seule la partie de la fenêtre qu'elle couvre compte
+    tracked (adresses en minuscules) : compte aussi les transferts envoyés ou reçus par ces wallets"""
+    data = jv.decode_json(jv.api_get(jv.API_URL, jv.transfer_params(wallet, lo, hi, PREVIEW_LIMIT, integrator)))
+    page = data.get("data", [])
+    covered = max(1, hi - lo)
+    if data.get("hasNext") and page:
+        stamps = [(it.get("sending") or {}).get("timestamp") or 0 for it in page]
+        descending = stamps[0] >= stamps[-1]
+        covered = max(1, hi - min(stamps)) if descending else max(1, max(stamps) - lo)
+    sample = {"from_ts": lo, "to_ts": hi, "covered": covered, "complete": not data.get("hasNext"),
+              "items": len(page), "tracked": 0, "transactions": 0, "bridge_value": 0.0, "swap_value": 0.0}
+    if tracked:
+        for item in page:
+            sender, receiver = (item.get("fromAddress") or "").lower(), (item.get("toAddress") or "").lower()
+            sample["tracked"] += (sender in tracked) + (receiver != sender and receiver in tracked)
+    for tx in jv.normalize_items(page, chain_map):
+        if not jv.is_valid_transaction(tx):
+            continue
+        sample["transactions"] += 1
+        if tx["from_blockchain"] == tx["to_blockchain"]:
+            sample["swap_value"] += tx["usd_value"]
+        else:
+            sample["bridge_value"] += tx["usd_value"]
+    return sample
+
+def extrapolate(samples: list, strata: list, metrics: tuple = METRICS) -> dict:
+    """Estimation stratifiée : métrique -> (estimation, borne basse, borne haute) à 95 %
+    Taux par seconde de chaque fenêtre × durée de sa strate ; écart-type entre strates"""
+    estimates = {}
+    observed_span = sum(s["covered"] for s in samples)
+    total_span = sum(strata)
+    for metric in metrics:
+        contributions = [s[metric] / s["covered"] * stratum for s, stratum in zip(samples, strata)]
+        estimate = sum(contributions)
+        observed = sum(s[metric] for s in samples)
+        if observed_span >= total_span or len(samples) < 2:
+            margin = 0.0  # Période entièrement lue (ou échantillon unique) : pas d'intervalle calculable
+        else:
+            margin = t_critical(len(samples) - 1) * statistics.stdev(contributions) * math.sqrt(len(samples))
+        estimates[metric] = (estimate, max(observed, estimate - margin), estimate + margin)
+    return estimates
+
+def preview(wallet, from_ts: int, to_ts: int, chain_map: dict, windows: int = PREVIEW_WINDOWS,
+            span: int = WINDOW_SPAN, integrator: str = None, seed: int = None) -> dict:
+    """Aperçu estimé d'une période : estimations, nombre de fenêtres lues et couverture"""
+    plan = plan_windows(from_ts, to_ts, windows, span, random.Random(seed))
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=PREVIEW_THREADS, thread_name_prefix="jumper-preview") as pool:
+        samples = list(pool.map(lambda w: sample_window(wallet, w[0], w[1], chain_map, integrator), plan))
+    return {
+        "estimates": extrapolate(samples, [stratum for _, _, stratum in plan]),
+        "windows": len(samples),
+        "coverage": min(1.0, sum(s["covered"] for s in samples) / max(1, to_ts - from_ts)),
+        "duration": time.perf_counter() - t0,
+    }
+
+# ==================== CRAWL EXACT EN ARRIÈRE-PLAN ====================
+class ExactCrawl(threading.Thread):
+    """Crawl complet dans un thread ; analyzer et progress sont lisibles pendant l'exécution"""
+    def __init__(self, wallet, from_ts: int, to_ts: int, chain_map: dict, integrator: str = None,
+                 on_done=None):
+        super().__init__(name="jumper-exact", daemon=True)
+        self.wallet = wallet
+        self.from_ts = from_ts
+        self.to_ts = to_ts
+        self.chain_map = chain_map
+        self.integrator = integrator
+        self.on_done = on_done  # on_done(crawl) appelé à la fin (succès, erreur ou annulation)
+        self.cancel = threading.Event()
+        self.analyzer = jv.TransactionAnalyzer()
+        self.progress = jv.new_progress(from_ts, to_ts)
+        self.error = None
+
+    def handle(self, items: list, progress: dict):
+        self.progress = dict(progress)
+        for tx in jv.normalize_items(items, self.chain_map):
+            if jv.is_valid_transaction(tx):
+                self.analyzer.add_transaction(tx)
+
+    def run(self):
+        try:
+            jv.fetch_all(self.wallet, self.from_ts, self.to_ts, raise_errors=True, on_page=self.handle,
+                         cancel=self.cancel, integrator=self.integrator)
+        except Exception as e:
+            self.error = e
+        finally:
+            if self.on_done is not None:
+                self.on_done(self)
+
+    @property
+    def complete(self) -> bool:
+        return not self.is_alive() and self.error is None and not self.cancel.is_set()
+
+def actuals(analyzer: jv.TransactionAnalyzer) -> dict:
+    """Valeurs exactes des métriques estimées par l'aperçu"""
+    return {"transactions": len(analyzer.transactions), "bridge_value": analyzer.bridge_value,
+            "swap_value": analyzer.swap_value}
+
+# ==================== AFFICHAGE ====================
+def metric_fmt(metric: str, value: float) -> str:
+    return f"{value:,.0f}" if metric == "transactions" else f"${value:,.2f}"
+
+def print_preview(result: dict):
+    print(f"\n⚡ APERÇU ESTIMÉ ({result['windows']} fenêtres, {result['coverage']:.1%} de la période lue, "
+          f"{result['duration']:.1f}s)")
+    for metric in METRICS:
+        estimate, low, high = result["estimates"][metric]
+        print(f"   • {metric:<13} ≈ {metric_fmt(metric, estimate):>20}   IC 95 % [{metric_fmt(metric, low)} ; "
+              f"{metric_fmt(metric, high)}]")
+
+def print_exact(result: dict, exact: dict):
+    print("\n✅ RÉSULTAT EXACT (remplace l'aperçu)")
+    for metric in METRICS:
+        estimate, low, high = result["estimates"][metric]
+        inside = "dans l'IC" if low <= exact[metric] <= high else "hors IC"
+        error = (estimate - exact[metric]) / exact[metric] if exact[metric] else 0.0
+        print(f"   • {metric:<13} = {metric_fmt(metric, exact[metric]):>20}   estimation {error:+.1%} ({inside})")
+
+# ==================== FONCTION PRINCIPALE ====================
+def main():
+    parser = argparse.ArgumentParser(description="Aperçu rapide estimé puis résultat exact")
+    parser.add_argument("--from-date", required=True, help="Date de début (YYYY-MM-DD)")
+    parser.add_argument("--wallet", default=jv.WALLET, help="Adresse du wallet (tout l'intégrateur par défaut)")
+    parser.add_argument("--integrator", help="Intégrateur (défaut : INTEGRATOR)")
+    parser.add_argument("--windows", type=int, default=PREVIEW_WINDOWS, help="Fenêtres échantillonnées")
+    parser.add_argument("--window-hours", type=float, default=WINDOW_SPAN / 3600, help="Durée max d'une fenêtre")
+    parser.add_argument("--preview-only", action="store_true", help="N'attend pas le crawl exact")
+    parser.add_argument("--seed", type=int, help="Graine du tirage des fenêtres")
+    args = parser.parse_args()
+
+    chain_map = jv.fetch_chains()
+    if not chain_map:
+        print("❌ Impossible de récupérer la liste des blockchains!")
+        return
+
+    from_ts = jv.to_unix(args.from_date)
+    to_ts = int(dt.datetime.now(dt.timezone.utc).timestamp())
+
+    crawl = None
+    if not args.preview_only:
+        # Le crawl exact démarre tout de suite ; l'aperçu partage avec lui le plafond de requêtes
+        crawl = ExactCrawl(args.wallet, from_ts, to_ts, chain_map, args.integrator)
+        crawl.start()
+
+    result = preview(args.wallet, from_ts, to_ts, chain_map, args.windows, int(args.window_hours * 3600),
+                     args.integrator, args.seed)
+    print_preview(result)
+    if crawl is None:
+        return
+
+    try:
+        while crawl.is_alive():
+            crawl.join(5)
+            if crawl.is_alive():
+                print(f"   ⏳ crawl exact : {crawl.progress['fraction']:.0%} "
+                      f"({len(crawl.analyzer.transactions)} tx)", flush=True)
+    except KeyboardInterrupt:
+        crawl.cancel.set()
+        crawl.join()
+        print("\n⏹️ Crawl exact interrompu : l'aperçu reste la seule estimation")
+        return
+    if crawl.error is not None:
+        print(f"❌ Crawl exact en échec : {crawl.error}")
+        return
+    print_exact(result, actuals(crawl.analyzer))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,613 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache local indexé des transferts Jumper Exchange (SQLite embarqué)
+Les requêtes par période / chaîne / plateforme / token se font sur le cache, sans recrawl
+"""
+import argparse
+import pickle
+import sqlite3
+import threading
+import time
+
+import jumper_volume as jv
+
+# ==================== CONFIGURATION ====================
+STORE_PATH = "jumper_transfers.db"
+RETENTION_DAYS = 90       # Lignes détaillées conservées sur cette fenêtre récente, agrégats journaliers au-delà
+COMPACT_BATCH_DAYS = 7    # Jours compactés au plus par périmètre et par passe (compaction incrémentale)
+
+COLUMNS = (
+    "tx_id", "tx_hash", "status", "timestamp",
+    "from_token", "from_blockchain", "from_chain_id", "from_amount",
+    "to_token", "to_blockchain", "to_chain_id", "to_amount",
+    "usd_value", "platform",
+    "from_tx_hash", "from_timestamp", "to_tx_hash", "to_timestamp",
+    "from_units", "from_decimals", "to_units", "to_decimals",
+)
+
+# Unités de base entières : peuvent dépasser 64 bits, stockées en texte
+UNIT_COLUMNS = ("from_units", "to_units")
+
+# Colonnes ajoutées après coup : (nom, type) ; les caches plus anciens sont migrés à l'ouverture
+ADDED_COLUMNS = (
+    ("from_tx_hash", "TEXT"),
+    ("from_timestamp", "INTEGER"),
+    ("to_tx_hash", "TEXT"),
+    ("to_timestamp", "INTEGER"),
+    ("from_units", "TEXT"),
+    ("from_decimals", "INTEGER"),
+    ("to_units", "TEXT"),
+    ("to_decimals", "INTEGER"),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transfers (
+    scope TEXT NOT NULL,
+    tx_hash TEXT NOT NULL,
+    tx_id TEXT,
+    status TEXT,
+    timestamp INTEGER NOT NULL,
+    from_token TEXT COLLATE NOCASE,
+    from_blockchain TEXT,
+    from_chain_id INTEGER,
+    from_amount REAL,
+    to_token TEXT COLLATE NOCASE,
+    to_blockchain TEXT,
+    to_chain_id INTEGER,
+    to_amount REAL,
+    usd_value REAL,
+    platform TEXT COLLATE NOCASE,
+    from_tx_hash TEXT,
+    from_timestamp INTEGER,
+    to_tx_hash TEXT,
+    to_timestamp INTEGER,
+    from_units TEXT,
+    from_decimals INTEGER,
+    to_units TEXT,
+    to_decimals INTEGER,
+    PRIMARY KEY (scope, tx_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_transfers_ts ON transfers (scope, timestamp);
+CREATE INDEX IF NOT EXISTS idx_transfers_from_chain ON transfers (scope, from_chain_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_transfers_to_chain ON transfers (scope, to_chain_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_transfers_platform ON transfers (scope, platform, timestamp);
+CREATE INDEX IF NOT EXISTS idx_transfers_from_token ON transfers (scope, from_token, timestamp);
+CREATE INDEX IF NOT EXISTS idx_transfers_to_token ON transfers (scope, to_token, timestamp);
+CREATE TABLE IF NOT EXISTS coverage (
+    scope TEXT PRIMARY KEY,
+    from_ts INTEGER NOT NULL,
+    to_ts INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    scope TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    from_chain_id INTEGER NOT NULL,
+    to_chain_id INTEGER NOT NULL,
+    from_blockchain TEXT,
+    to_blockchain TEXT,
+    platform TEXT COLLATE NOCASE NOT NULL,
+    transactions INTEGER NOT NULL,
+    usd_value REAL NOT NULL,
+    PRIMARY KEY (scope, day, from_chain_id, to_chain_id, platform)
+);
+CREATE TABLE IF NOT EXISTS compaction (
+    scope TEXT PRIMARY KEY,
+    compacted_before INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS compacted_ranges (
+    scope TEXT NOT NULL,
+    from_ts INTEGER NOT NULL,
+    to_ts INTEGER NOT NULL,
+    PRIMARY KEY (scope, from_ts)
+);
+CREATE TABLE IF NOT EXISTS materialized (
+    scope TEXT NOT NULL,
+    from_ts INTEGER NOT NULL,
+    computed_at REAL NOT NULL,
+    state BLOB NOT NULL,
+    PRIMARY KEY (scope, from_ts)
+);
+CREATE TABLE IF NOT EXISTS worker_runs (
+    scope TEXT PRIMARY KEY,
+    wallet TEXT,
+    started_at REAL,
+    duration REAL,
+    ok INTEGER,
+    transactions INTEGER,
+    error TEXT,
+    last_success REAL,
+    next_run REAL
+);
+"""
+
+# ==================== UTILITAIRES ====================
+def scope_key(wallet, integrator: str = None) -> str:
+    """Clé de périmètre d'un crawl : intégrateur (INTEGRATOR par défaut) + wallet (ou * pour tout l'intégrateur)"""
+    return f"{integrator or jv.INTEGRATOR}:{wallet.lower() if wallet else '*'}"
+
+def day_start(ts: int) -> int:
+    """Début (UTC) du jour contenant ts"""
+    return int(ts) - int(ts) % 86400
+
+def build_filters(start=None, end=None, from_chain_id=None, to_chain_id=None,
+                  platform=None, token=None, kind=None) -> tuple:
+    """Construit la clause WHERE (hors périmètre) et ses paramètres"""
+    # Mêmes critères que jv.is_valid_transaction
+    clauses = ["tx_id != ''", "from_token != ''", "to_token != ''"]
+    params = []
+    if start is not None:
+        clauses.append("timestamp >= ?")
+        params.append(int(start))
+    if end is not None:
+        clauses.append("timestamp <= ?")
+        params.append(int(end))
+    if from_chain_id is not None:
+        clauses.append("from_chain_id = ?")
+        params.append(int(from_chain_id))
+    if to_chain_id is not None:
+        clauses.append("to_chain_id = ?")
+        params.append(int(to_chain_id))
+    if platform:
+        clauses.append("platform = ?")
+        params.append(platform)
+    if token:
+        clauses.append("(from_token = ? OR to_token = ?)")
+        params.extend([token, token])
+    if kind == "bridge":
+        clauses.append("from_blockchain != to_blockchain")
+    elif kind == "swap":
+        clauses.append("from_blockchain = to_blockchain")
+    return " AND ".join(clauses), params
+
+def build_rollup_filters(start=None, end=None, from_chain_id=None, to_chain_id=None,
+                         platform=None, token=None, kind=None):
+    """Équivalent de build_filters sur daily_rollups : un jour compte si son début est dans [start, end]
+    (exact pour des bornes alignées sur les jours) ; None si un filtre n'y est pas applicable (token)"""
+    if token:
+        return None
+    clauses = ["1"]
+    params = []
+    if start is not None:
+        clauses.append("day >= ?")
+        params.append(int(start))
+    if end is not None:
+        clauses.append("day <= ?")
+        params.append(int(end))
+    if from_chain_id is not None:
+        clauses.append("from_chain_id = ?")
+        params.append(int(from_chain_id))
+    if to_chain_id is not None:
+        clauses.append("to_chain_id = ?")
+        params.append(int(to_chain_id))
+    if platform:
+        clauses.append("platform = ?")
+        params.append(platform)
+    if kind == "bridge":
+        clauses.append("from_blockchain != to_blockchain")
+    elif kind == "swap":
+        clauses.append("from_blockchain = to_blockchain")
+    return " AND ".join(clauses), params
+
+def unified_source(scope_clause: str, scope_args: list, **filters) -> tuple:
+    """Sous-requête (scope, from_blockchain, to_blockchain, platform, n, usd_value) : lignes détaillées
+    des périodes récentes + agrégats journaliers des périodes compactées"""
+    where, params = build_filters(**filters)
+    sql = ("SELECT scope, from_blockchain, to_blockchain, platform, 1 AS n, usd_value FROM transfers "
+           f"WHERE {scope_clause} AND {where}")
+    args = [*scope_args, *params]
+    rollup = build_rollup_filters(**filters)
+    if rollup is not None:
+        rollup_where, rollup_params = rollup
+        sql += (" UNION ALL SELECT scope, from_blockchain, to_blockchain, platform, transactions, usd_value "
+                f"FROM daily_rollups WHERE {scope_clause} AND {rollup_where}")
+        args += [*scope_args, *rollup_params]
+    return sql, args
+
+def to_row(tx: dict) -> tuple:
+    """Valeurs d'une transaction normalisée dans l'ordre de COLUMNS"""
+    return tuple(
+        str(tx[c]) if c in UNIT_COLUMNS and tx.get(c) is not None else tx.get(c)
+        for c in COLUMNS
+    )
+
+def from_row(row) -> dict:
+    """Transaction normalisée à partir d'une ligne de la table transfers"""
+    tx = dict(row)
+    for c in UNIT_COLUMNS:
+        if tx.get(c) is not None:
+            tx[c] = int(tx[c])
+    return tx
+
+# ==================== STOCKAGE ====================
+class TransferStore:
+    """Transferts normalisés persistés en SQLite, indexés par date, chaînes, plateforme et token"""
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.migrate()
+
+    def migrate(self):
+        """Ajoute les colonnes manquantes d'un cache plus ancien"""
+        existing = {row["name"] for row in self.conn.execute("PRAGMA table_info(transfers)")}
+        missing = [(name, kind) for name, kind in ADDED_COLUMNS if name not in existing]
+        with self.conn:
+            for name, kind in missing:
+                self.conn.execute(f"ALTER TABLE transfers ADD COLUMN {name} {kind}")
+            if missing:
+                # Les lignes existantes n'ont pas ces champs : tout sera re-synchronisé
+                self.conn.execute("DELETE FROM coverage")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_transfers_hash ON transfers (tx_hash)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_transfers_to_hash ON transfers (to_tx_hash)")
+            # Caches compactés avant compacted_ranges : du premier jour agrégé au watermark
+            self.conn.execute(
+                "INSERT INTO compacted_ranges (scope, from_ts, to_ts) "
+                "SELECT r.scope, MIN(r.day), c.compacted_before - 1 FROM daily_rollups r JOIN compaction c "
+                "ON c.scope = r.scope WHERE r.scope NOT IN (SELECT scope FROM compacted_ranges) GROUP BY r.scope"
+            )
+
+    def close(self):
+        self.conn.close()
+
+    def upsert(self, wallet, transactions: list, integrator: str = None):
+        """Insère ou met à jour des transactions normalisées
+        Un transfert finalisé d'une plage effectivement compactée est déjà compté dans les agrégats : seule une
+        ligne détaillée encore présente (transfert alors en cours) est mise à jour ; hors de ces plages
+        (backfill antérieur, re-synchronisation après migration), il est inséré"""
+        scope = scope_key(wallet, integrator)
+        placeholders = ", ".join("?" * (len(COLUMNS) + 1))
+        with self.lock, self.conn:
+            ranges = self._compacted_ranges(scope)
+            fresh, compacted = [], []
+            for tx in transactions:
+                if not tx.get("tx_hash"):
+                    continue
+                if tx.get("status") in jv.FINAL_STATUSES and any(lo <= tx["timestamp"] <= hi for lo, hi in ranges):
+                    compacted.append((*to_row(tx), scope, tx["tx_hash"]))
+                else:
+                    fresh.append((scope, *to_row(tx)))
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO transfers (scope, {', '.join(COLUMNS)}) VALUES ({placeholders})",
+                fresh,
+            )
+            if compacted:
+                self.conn.executemany(
+                    f"UPDATE transfers SET {', '.join(f'{c} = ?' for c in COLUMNS)} WHERE scope = ? AND tx_hash = ?",
+                    compacted,
+                )
+
+    def coverage(self, wallet, integrator: str = None):
+        """Période déjà synchronisée (from_ts, to_ts) ou None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT from_ts, to_ts FROM coverage WHERE scope = ?", (scope_key(wallet, integrator),)
+            ).fetchone()
+        return (row["from_ts"], row["to_ts"]) if row else None
+
+    def mark_synced(self, wallet, from_ts: int, to_ts: int, integrator: str = None):
+        """Étend la période synchronisée d'un périmètre"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO coverage (scope, from_ts, to_ts) VALUES (?, ?, ?) "
+                "ON CONFLICT(scope) DO UPDATE SET from_ts = MIN(from_ts, excluded.from_ts), "
+                "to_ts = MAX(to_ts, excluded.to_ts)",
+                (scope_key(wallet, integrator), int(from_ts), int(to_ts)),
+            )
+
+    def sync(self, wallet, chain_map: dict, from_ts: int, to_ts: int, on_page=None, cancel=None,
+             integrator: str = None) -> int:
+        """Ne récupère via l'API que les périodes pas encore présentes dans le cache
+        Chaque page est écrite dès réception ; on_page(transactions, progress) est appelé ensuite"""
+        covered = self.coverage(wallet, integrator)
+        if covered is None:
+            gaps = [(from_ts, to_ts)]
+        else:
+            lo, hi = covered
+            gaps = []
+            if from_ts < lo:
+                gaps.append((from_ts, lo))
+            if to_ts > hi:
+                gaps.append((hi, to_ts))
+
+        fetched = 0
+
+        def handle(items, progress):
+            nonlocal fetched
+            transactions = jv.normalize_items(items, chain_map)
+            self.upsert(wallet, transactions, integrator)
+            fetched += len(transactions)
+            if on_page is not None:
+                on_page(transactions, progress)
+
+        for gap_from, gap_to in gaps:
+            # Une période incomplète (erreur ou annulation) n'est pas marquée comme synchronisée
+            jv.fetch_all(wallet, gap_from, gap_to, limit=200, raise_errors=True, on_page=handle, cancel=cancel,
+                         integrator=integrator)
+            if cancel is not None and cancel.is_set():
+                break
+            self.mark_synced(wallet, gap_from, gap_to, integrator)
+        return fetched
+
+    def query(self, wallet, integrator: str = None, **filters) -> list:
+        """Transactions normalisées du cache correspondant aux filtres, plus récentes d'abord"""
+        where, params = build_filters(**filters)
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM transfers WHERE scope = ? AND {where} "
+                "ORDER BY timestamp DESC",
+                [scope_key(wallet, integrator), *params],
+            ).fetchall()
+        return [from_row(row) for row in rows]
+
+    def find(self, tx_hash: str):
+        """Transfert (tous périmètres) dont l'une des jambes a ce txHash, ou None"""
+        with self.lock:
+            row = self.conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM transfers WHERE tx_hash = ? OR to_tx_hash = ? LIMIT 1",
+                (tx_hash, tx_hash),
+            ).fetchone()
+        return from_row(row) if row else None
+
+    def summary(self, wallet, **filters) -> dict:
+        """Agrégats (mêmes totaux que TransactionAnalyzer) calculés directement en SQL
+        Les périodes compactées sont lues dans les agrégats journaliers"""
+        source, args = unified_source("scope = ?", [scope_key(wallet)], **filters)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT COALESCE(SUM(n), 0) AS transactions, "
+                "COALESCE(SUM(CASE WHEN from_blockchain != to_blockchain THEN n END), 0) AS bridges, "
+                "COALESCE(SUM(CASE WHEN from_blockchain = to_blockchain THEN n END), 0) AS swaps, "
+                "COALESCE(SUM(CASE WHEN from_blockchain != to_blockchain THEN usd_value END), 0) AS bridge_value, "
+                "COALESCE(SUM(CASE WHEN from_blockchain = to_blockchain THEN usd_value END), 0) AS swap_value, "
+                f"COALESCE(SUM(usd_value), 0) AS total_value FROM ({source})",
+                args,
+            ).fetchone()
+            platforms = self.conn.execute(
+                f"SELECT platform, SUM(n) AS n FROM ({source}) GROUP BY platform ORDER BY n DESC",
+                args,
+            ).fetchall()
+        result = dict(row)
+        result["platforms"] = {p["platform"]: p["n"] for p in platforms}
+        return result
+
+    def wallet_rollups(self, **filters) -> list:
+        """Un agrégat par wallet de l'intégrateur présent dans le cache (GROUP BY, sans boucle Python)"""
+        prefix = f"{jv.INTEGRATOR}:0x"
+        source, args = unified_source("scope >= ? AND scope < ?", [prefix, prefix[:-1] + "y"], **filters)
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT t.scope, t.transactions, t.bridge_value, t.swap_value, t.total_value, "
+                "t.platforms, c.chains FROM ("
+                "  SELECT scope, SUM(n) AS transactions, "
+                "  COALESCE(SUM(CASE WHEN from_blockchain != to_blockchain THEN usd_value END), 0) AS bridge_value, "
+                "  COALESCE(SUM(CASE WHEN from_blockchain = to_blockchain THEN usd_value END), 0) AS swap_value, "
+                "  COALESCE(SUM(usd_value), 0) AS total_value, "
+                "  COUNT(DISTINCT platform) AS platforms "
+                f"  FROM ({source}) GROUP BY scope"
+                ") AS t JOIN ("
+                "  SELECT scope, COUNT(DISTINCT chain) AS chains FROM ("
+                f"    SELECT scope, from_blockchain AS chain FROM ({source})"
+                f"    UNION SELECT scope, to_blockchain FROM ({source})"
+                "  ) GROUP BY scope"
+                ") AS c USING (scope)",
+                args * 3,
+            ).fetchall()
+        return [dict(row, wallet=row["scope"].split(":", 1)[1]) for row in rows]
+
+    # ---------- Rétention et compaction ----------
+    def _compacted_before(self, scope: str) -> int:
+        row = self.conn.execute("SELECT compacted_before FROM compaction WHERE scope = ?", (scope,)).fetchone()
+        return row["compacted_before"] if row else 0
+
+    def _compacted_ranges(self, scope: str) -> list:
+        """Plages [début, fin] (timestamps des transferts repliés) déjà comptées dans daily_rollups"""
+        return [(row["from_ts"], row["to_ts"]) for row in self.conn.execute(
+            "SELECT from_ts, to_ts FROM compacted_ranges WHERE scope = ?", (scope,))]
+
+    def compacted_before(self, wallet, integrator: str = None) -> int:
+        """Date (timestamp) avant laquelle les transferts finalisés ne sont plus qu'en agrégats journaliers (0 : aucune)"""
+        with self.lock:
+            return self._compacted_before(scope_key(wallet, integrator))
+
+    def compact(self, retention_days: int = RETENTION_DAYS, max_days: int = COMPACT_BATCH_DAYS,
+                all_scopes: bool = False, now: float = None) -> int:
+        """Une passe de compaction : transferts finalisés antérieurs à la fenêtre de rétention -> agrégats
+        journaliers (chaînes, plateforme, USD), au plus max_days jours par périmètre ; renvoie les lignes compactées
+        Par défaut seuls les périmètres « tout l'intégrateur » sont compactés : le détail des wallets est conservé"""
+        cutoff = day_start((now or time.time()) - retention_days * 86400)
+        final = sorted(jv.FINAL_STATUSES)
+        statuses = f"status IN ({', '.join('?' * len(final))})"
+        valid, _ = build_filters()
+        with self.lock:
+            scopes = self.conn.execute(
+                f"SELECT scope, MIN(timestamp) AS oldest FROM transfers WHERE timestamp < ? AND {statuses} "
+                f"{'' if all_scopes else 'AND scope LIKE ?'} GROUP BY scope",
+                [cutoff, *final] + ([] if all_scopes else ["%:*"]),
+            ).fetchall()
+
+        compacted = 0
+        for row in scopes:
+            lo = day_start(row["oldest"])
+            hi = min(cutoff, lo + max_days * 86400)
+            bounds = [row["scope"], lo, hi, *final]
+            # Une transaction par périmètre : le verrou est relâché entre deux, les lectures s'intercalent
+            with self.lock, self.conn:
+                # Plage réellement repliée : bornée par les transferts présents, pas par les jours [lo, hi)
+                self.conn.execute(
+                    "INSERT INTO compacted_ranges (scope, from_ts, to_ts) "
+                    "SELECT scope, MIN(timestamp), MAX(timestamp) FROM transfers "
+                    f"WHERE scope = ? AND timestamp >= ? AND timestamp < ? AND {statuses} GROUP BY scope "
+                    "ON CONFLICT (scope, from_ts) DO UPDATE SET to_ts = MAX(to_ts, excluded.to_ts)",
+                    bounds,
+                )
+                self.conn.execute(
+                    "INSERT INTO daily_rollups (scope, day, from_chain_id, to_chain_id, from_blockchain, "
+                    "to_blockchain, platform, transactions, usd_value) "
+                    "SELECT scope, timestamp - timestamp % 86400 AS d, IFNULL(from_chain_id, 0) AS fc, "
+                    "IFNULL(to_chain_id, 0) AS tc, MAX(from_blockchain), MAX(to_blockchain), "
+                    "IFNULL(platform, '') AS p, COUNT(*), COALESCE(SUM(usd_value), 0) FROM transfers "
+                    f"WHERE scope = ? AND timestamp >= ? AND timestamp < ? AND {statuses} AND {valid} "
+                    "GROUP BY d, fc, tc, p "
+                    "ON CONFLICT (scope, day, from_chain_id, to_chain_id, platform) DO UPDATE SET "
+                    "transactions = transactions + excluded.transactions, usd_value = usd_value + excluded.usd_value",
+                    bounds,
+                )
+                compacted += self.conn.execute(
+                    f"DELETE FROM transfers WHERE scope = ? AND timestamp >= ? AND timestamp < ? AND {statuses}",
+                    bounds,
+                ).rowcount
+                self.conn.execute(
+                    "INSERT INTO compaction (scope, compacted_before) VALUES (?, ?) ON CONFLICT(scope) "
+                    "DO UPDATE SET compacted_before = MAX(compacted_before, excluded.compacted_before)",
+                    (row["scope"], hi),
+                )
+        return compacted
+
+    def storage_stats(self) -> dict:
+        """Lignes détaillées et agrégats journaliers présents dans le cache"""
+        with self.lock:
+            return {
+                "transfers": self.conn.execute("SELECT COUNT(*) FROM transfers").fetchone()[0],
+                "rollups": self.conn.execute("SELECT COUNT(*) FROM daily_rollups").fetchone()[0],
+            }
+
+    # ---------- Résultats matérialisés (jumper_worker) ----------
+    def save_materialized(self, state: jv.SyncState, from_ts: int):
+        """Enregistre un SyncState calculé pour lecture directe par le dashboard"""
+        blob = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO materialized (scope, from_ts, computed_at, state) VALUES (?, ?, ?, ?)",
+                (scope_key(state.wallet), int(from_ts), time.time(), blob),
+            )
+
+    def load_materialized(self, wallet, from_ts: int):
+        """SyncState matérialisé (rattaché à ce cache) et son âge en secondes, ou (None, None)
+        Le résultat couvrant la période demandée au plus près est restreint à partir de from_ts"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT from_ts, computed_at, state FROM materialized WHERE scope = ? AND from_ts <= ? "
+                "ORDER BY from_ts DESC LIMIT 1",
+                (scope_key(wallet), int(from_ts)),
+            ).fetchone()
+        if row is None:
+            return None, None
+        state = pickle.loads(row["state"])
+        if vars(state).keys() != vars(jv.SyncState(wallet, {})).keys() or \
+                vars(state.analyzer).keys() != vars(jv.TransactionAnalyzer()).keys():
+            return None, None  # Calculé par une version antérieure : à recalculer
+        state.store = self
+        if row["from_ts"] < from_ts:
+            state = state.trimmed(from_ts)
+        return state, time.time() - row["computed_at"]
+
+    def record_run(self, wallet, started_at: float, duration: float, transactions: int = 0,
+                   error: str = None, next_run: float = None):
+        """Trace d'exécution du worker pour un wallet"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO worker_runs (scope, wallet, started_at, duration, ok, transactions, error, "
+                "last_success, next_run) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(scope) DO UPDATE SET "
+                "started_at = excluded.started_at, duration = excluded.duration, ok = excluded.ok, "
+                "transactions = CASE WHEN excluded.ok THEN excluded.transactions ELSE transactions END, "
+                "error = excluded.error, last_success = COALESCE(excluded.last_success, last_success), "
+                "next_run = excluded.next_run",
+                (scope_key(wallet), wallet, started_at, duration, int(error is None), transactions, error,
+                 started_at + duration if error is None else None, next_run),
+            )
+
+    def worker_status(self) -> list:
+        """État du worker par wallet, avec l'ancienneté du dernier succès"""
+        now = time.time()
+        with self.lock:
+            rows = self.conn.execute("SELECT * FROM worker_runs ORDER BY wallet").fetchall()
+        return [
+            dict(row, staleness=now - row["last_success"] if row["last_success"] else None)
+            for row in rows
+        ]
+
+# ==================== FONCTION PRINCIPALE ====================
+def main():
+    parser = argparse.ArgumentParser(description="Requêtes sur le cache local des transferts Jumper")
+    parser.add_argument("--wallet", default=jv.WALLET, help="Adresse du wallet (tout l'intégrateur par défaut)")
+    parser.add_argument("--start", help="Date de début (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Date de fin exclue (YYYY-MM-DD)")
+    parser.add_argument("--from-chain", type=int, help="chainId source")
+    parser.add_argument("--to-chain", type=int, help="chainId destination")
+    parser.add_argument("--platform", help="Outil / plateforme (ex: stargate)")
+    parser.add_argument("--token", help="Symbole du token (source ou destination)")
+    parser.add_argument("--kind", choices=["bridge", "swap"])
+    parser.add_argument("--sync", action="store_true", help="Complète d'abord le cache via l'API")
+    parser.add_argument("--compact", action="store_true",
+                        help="Compacte en agrégats journaliers les transferts hors fenêtre de rétention, puis quitte")
+    parser.add_argument("--retention-days", type=int, default=RETENTION_DAYS, help="Fenêtre de rétention détaillée")
+    parser.add_argument("--all-scopes", action="store_true", help="Compacte aussi les périmètres par wallet")
+    parser.add_argument("--tx", metavar="HASH", help="Affiche le transfert en cache dont l'une des jambes a ce txHash")
+    parser.add_argument("--store", default=STORE_PATH, help="Chemin de la base SQLite")
+    args = parser.parse_args()
+
+    store = TransferStore(args.store)
+    if args.tx:
+        tx = store.find(args.tx)
+        if tx is None:
+            print(f"❌ Aucun transfert en cache pour {jv.shorten_tx(args.tx)}")
+            return
+        print(f"🔗 {tx['platform']} • {tx['from_blockchain']} → {tx['to_blockchain']} • {tx['status']} • "
+              f"{jv.usd_fmt(tx['usd_value'])}")
+        for label, leg_hash, leg_ts in (("envoi    ", tx["from_tx_hash"], tx["from_timestamp"] or tx["timestamp"]),
+                                        ("réception", tx["to_tx_hash"], tx["to_timestamp"])):
+            print(f"   • {label} {leg_hash or '-'}" + (f" ({jv.iso_and_relative(leg_ts)})" if leg_ts else ""))
+        latency = jv.settlement_latency(tx)
+        if latency is not None:
+            print(f"   • règlement en {jv.duration_fmt(latency)}")
+        return
+    if args.compact:
+        total = 0
+        while True:
+            compacted = store.compact(args.retention_days, all_scopes=args.all_scopes)
+            if not compacted:
+                break
+            total += compacted
+            print(f"📦 {total} ligne(s) compactée(s)...", flush=True)
+        stats = store.storage_stats()
+        print(f"✅ {total} ligne(s) compactée(s) • {stats['transfers']} lignes détaillées, "
+              f"{stats['rollups']} agrégats journaliers")
+        return
+
+    start = jv.to_unix(args.start) if args.start else None
+    end = jv.to_unix(args.end) - 1 if args.end else None
+
+    if args.sync:
+        if start is None:
+            print("❌ --sync nécessite --start")
+            return
+        chain_map = jv.fetch_chains()
+        to_ts = end or int(jv.dt.datetime.now(jv.dt.timezone.utc).timestamp())
+        print(f"✅ {store.sync(args.wallet, chain_map, start, to_ts)} transfert(s) ajoutés au cache")
+
+    transactions = store.query(
+        args.wallet, start=start, end=end, from_chain_id=args.from_chain, to_chain_id=args.to_chain,
+        platform=args.platform, token=args.token, kind=args.kind,
+    )
+    analyzer = jv.TransactionAnalyzer()
+    if analyzer.analyze_transactions(transactions):
+        analyzer.print_results()
+
+    watermark = store.compacted_before(args.wallet)
+    if watermark and (start is None or start < watermark):
+        # Le détail de la période compactée n'existe plus : totaux lus dans les agrégats journaliers
+        summary = store.summary(
+            args.wallet, start=start, end=end, from_chain_id=args.from_chain, to_chain_id=args.to_chain,
+            platform=args.platform, token=args.token, kind=args.kind,
+        )
+        print(f"📦 Détail compacté avant le {jv.dt.datetime.fromtimestamp(watermark, jv.dt.timezone.utc):%Y-%m-%d} "
+              f"— totaux agrégats compris{' (sauf filtre token, absent des agrégats)' if args.token else ''} :")
+        print(f"   • {summary['transactions']} transaction(s) • {summary['bridges']} bridge(s) • "
+              f"{summary['swaps']} swap(s) • ${summary['total_value']:,.2f}")
+
+if __name__ == "__main__":
+    main()
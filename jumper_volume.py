@@ -4,18 +4,38 @@
 Script unifié pour analyser les volumes de transactions Jumper Exchange
 Version optimisée : tout en mémoire, sans écriture de fichiers intermédiaires
 """
+import argparse
 import datetime as dt
+import threading
 import time
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import math
 import re
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from functools import lru_cache
+from urllib.parse import urlparse
 
 # ==================== CONFIGURATION ====================
 API_URL = "https://li.quest/v2/analytics/transfers"
 CHAINS_URL = "https://chainid.network/chains.json"
+STATUS_URL = "https://li.quest/v1/status"
 INTEGRATOR = "jumper.exchange"
 WALLET = None  
+FINAL_STATUSES = {"DONE", "FAILED", "INVALID"}  # Statuts qui ne changeront plus
+CHART_MAX_POINTS = 500  # Nombre max de points envoyés par graphique
+FOLLOW_INTERVAL = 30    # Intervalle de scrutation du mode suivi (secondes)
+PAGE_DELAY = 0.1        # Pause entre deux pages (secondes)
+POOL_SIZE = 16          # Connexions keep-alive conservées par hôte
+TIMEOUT = (5, 30)       # (connexion, lecture) en secondes
+HEDGE = True            # Requête de couverture si une page dépasse le p95 observé
+HEDGE_DEFAULT_DELAY = 2.0   # Délai avant couverture tant que le p95 n'est pas mesurable
+HEDGE_MIN_SAMPLES = 20
+BREAKER_THRESHOLD = 5   # Échecs consécutifs avant ouverture du disjoncteur
+BREAKER_COOLDOWN = 60   # Durée d'ouverture avant un nouvel essai (secondes)
+API_CONCURRENCY = 8     # Requêtes simultanées max vers l'API, tous appelants confondus
 
 # ==================== UTILITAIRES ====================
 def to_unix(ts_str: str) -> int:
@@ -33,15 +53,37 @@ def usd_fmt(x):
         return "$0.0000"
     return f"${x:,.4f}".replace(",", " ")
 
-def amt_fmt(raw_amount, decimals):
-    """Formate un montant de token"""
-    if raw_amount is None or decimals is None:
-        return "0.0000"
+def duration_fmt(seconds) -> str:
+    """Formate une durée en secondes (ex. 45s, 3 min 20s, 1 h 05)"""
+    seconds = int(round(seconds or 0))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60} min {seconds % 60:02d}s"
+    return f"{seconds // 3600} h {seconds % 3600 // 60:02d}"
+
+@lru_cache(maxsize=None)
+def unit_scale(decimals: int) -> int:
+    """10 ** decimals, calculé une fois par nombre de décimales"""
+    return 10 ** decimals
+
+def to_units(raw_amount):
+    """Montant brut de l'API en unités de base entières, None si absent ou invalide"""
     try:
-        val = int(raw_amount) / (10 ** decimals)
-        return f"{val:.4f}"
-    except:
-        return "0.0000"
+        return int(raw_amount)
+    except (TypeError, ValueError):
+        return None
+
+def units_to_float(units: int, decimals: int) -> float:
+    """Unités de base -> float (division entière exacte, un seul arrondi)"""
+    return units / unit_scale(decimals)
+
+def units_str(units: int, decimals: int, places: int = 4) -> str:
+    """Unités de base -> chaîne décimale tronquée à places décimales, sans passer par un float"""
+    sign = "-" if units < 0 else ""
+    whole, frac = divmod(abs(units), unit_scale(decimals))
+    frac_str = str(frac).rjust(decimals, "0")[:places].ljust(places, "0")
+    return f"{sign}{whole}.{frac_str}" if places else f"{sign}{whole}"
 
 def iso_and_relative(utc_ts: int) -> str:
     """Formate un timestamp en date relative et ISO"""
@@ -60,45 +102,260 @@ def iso_and_relative(utc_ts: int) -> str:
     iso_str = t.strftime("%d %b %Y (%H:%M UTC)")
     return f"{rel_str} • {iso_str}"
 
+# ==================== TRANSPORT HTTP ====================
+try:
+    import brotli  # noqa: F401  (décodage "br" par urllib3)
+    ACCEPT_ENCODING = "br, gzip, deflate"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "br, gzip, deflate"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+# Décodage JSON : orjson s'il est installé, sinon json standard directement sur les octets
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+def decode_json(r: requests.Response):
+    """Décode le corps d'une réponse sans passer par r.text (ni détection d'encodage)"""
+    return json_loads(r.content)
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """Session HTTP partagée : pool keep-alive dimensionné pour les récupérations parallèles"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"Accept-Encoding": ACCEPT_ENCODING, "Connection": "keep-alive"})
+            _session = session
+        return _session
+
+def reset_session():
+    """Ferme la session partagée (la prochaine requête en recrée une)"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+# ==================== RÉSILIENCE (HEDGING + DISJONCTEUR) ====================
+class CircuitOpenError(Exception):
+    """Levée quand le disjoncteur refuse un appel (API jugée indisponible)"""
+
+class LatencyTracker:
+    """Fenêtre glissante des durées de requêtes réussies"""
+    def __init__(self, size: int = 200):
+        self.samples = deque(maxlen=size)
+        self.lock = threading.Lock()
+    
+    def record(self, seconds: float):
+        with self.lock:
+            self.samples.append(seconds)
+    
+    def p95(self) -> float:
+        with self.lock:
+            if len(self.samples) < HEDGE_MIN_SAMPLES:
+                return HEDGE_DEFAULT_DELAY
+            ordered = sorted(self.samples)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+class CircuitBreaker:
+    """Disjoncteur : après BREAKER_THRESHOLD échecs, refuse les appels pendant BREAKER_COOLDOWN"""
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+        self.lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+    
+    def allow(self) -> bool:
+        """Autorise l'appel ; une seule requête d'essai une fois le délai écoulé"""
+        with self.lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.trial:
+                self.trial = True
+                return True
+            return False
+    
+    def success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial = False
+    
+    def failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self.trial = False
+    
+    def release(self):
+        """Appel terminé sans résultat (annulation) : la requête d'essai peut être retentée"""
+        with self.lock:
+            self.trial = False
+
+api_slots = threading.BoundedSemaphore(API_CONCURRENCY)  # Plafond global de concurrence
+latencies = defaultdict(LatencyTracker)  # Par hôte
+response_hooks = []  # Appelés avec (url, params, réponse) après chaque réponse réussie
+breakers = defaultdict(CircuitBreaker)   # Par hôte
+_executor = None
+
+def set_api_concurrency(limit: int):
+    """Redimensionne le plafond global de requêtes simultanées"""
+    global api_slots, API_CONCURRENCY
+    API_CONCURRENCY = limit
+    api_slots = threading.BoundedSemaphore(limit)
+
+def get_executor() -> ThreadPoolExecutor:
+    """Pool de threads partagé pour les requêtes (et leurs couvertures)"""
+    global _executor
+    with _session_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="jumper-http")
+        return _executor
+
+def is_api_failure(error: Exception) -> bool:
+    """Les 4xx (hors 429) sont des réponses valides de l'API, pas une panne"""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        code = error.response.status_code
+        return code >= 500 or code == 429
+    return True
+
+def api_get(url: str, params: dict = None, session=None) -> requests.Response:
+    """GET avec requête de couverture au-delà du p95 observé ; la première réponse gagne"""
+    host = urlparse(url).netloc
+    breaker, tracker = breakers[host], latencies[host]
+    if not breaker.allow():
+        raise CircuitOpenError(f"API {host} indisponible, nouvel essai dans {breaker.cooldown}s")
+    session = session or get_session()
+    params = dict(params or {})
+    
+    def attempt():
+        with api_slots:
+            t0 = time.perf_counter()
+            r = session.get(url, params=params, timeout=TIMEOUT)
+        r.raise_for_status()
+        tracker.record(time.perf_counter() - t0)
+        return r
+    
+    pool = get_executor()
+    futures = [pool.submit(attempt)]
+    if HEDGE:
+        done, _ = wait(futures, timeout=tracker.p95())
+        if not done:
+            futures.append(pool.submit(attempt))
+    
+    error = None
+    for future in as_completed(futures):
+        try:
+            r = future.result()
+        except Exception as e:
+            error = e
+            continue
+        breaker.success()
+        for hook in response_hooks:
+            try:
+                hook(url, params, r)
+            except Exception as e:
+                print(f"⚠️ Erreur du hook {getattr(hook, '__qualname__', hook)}: {e}")
+        return r
+    
+    if is_api_failure(error):
+        breaker.failure()
+    else:
+        breaker.success()
+    raise error
+
 # ==================== GESTION DES CHAÎNES ====================
+_chains_cache = {}
+
+def parse_chains(chains: list) -> dict:
+    """chainId -> nom à partir de la réponse de l'API, mémorisé comme dernière liste connue"""
+    mapping = {}
+    for c in chains:
+        try:
+            cid = c.get("chainId")
+            name = c.get("name")
+            if cid and name:
+                mapping[int(cid)] = name
+        except Exception:
+            continue
+    _chains_cache.update(mapping)
+    return mapping
+
 def fetch_chains() -> dict:
-    """Télécharge et retourne la liste des blockchains (en mémoire)"""
+    """Télécharge et retourne la liste des blockchains (dernière liste connue si indisponible)"""
     print("\n🔄 Récupération de la liste des blockchains...")
     try:
-        r = requests.get(CHAINS_URL, timeout=30)
-        r.raise_for_status()
-        chains = r.json()
-        
-        mapping = {}
-        for c in chains:
-            try:
-                cid = c.get("chainId")
-                name = c.get("name")
-                if cid and name:
-                    mapping[int(cid)] = name
-            except Exception:
-                continue
-        
+        r = api_get(CHAINS_URL)
+        mapping = parse_chains(decode_json(r))
         print(f"✅ {len(mapping)} chaînes récupérées")
         return mapping
     except Exception as e:
         print(f"❌ Erreur lors de la récupération des chaînes: {e}")
-        return {}
+        return dict(_chains_cache)
 
 # ==================== RÉCUPÉRATION DES DONNÉES ====================
-def fetch_all(wallet: str, from_ts: int, to_ts: int, limit: int = 200):
-    """Récupère toutes les transactions via l'API"""
-    params = {
+def transfer_params(wallet: str, from_ts: int, to_ts: int, limit: int = 200, integrator: str = None) -> dict:
+    """Paramètres de la première page de l'API analytics (partagés par les clients sync et async)"""
+    return {
         "wallet": wallet,
         "fromTimestamp": from_ts,
         "toTimestamp": to_ts,
         "status": "ALL",
-        "integrator": INTEGRATOR,
+        "integrator": integrator or INTEGRATOR,
         "limit": limit,
     }
+
+def new_progress(from_ts: int, to_ts: int) -> dict:
+    """Avancement initial d'un crawl"""
+    return {"pages": 0, "transfers": 0, "position": None, "fraction": 0.0,
+            "descending": True, "from_ts": from_ts, "to_ts": to_ts}
+
+def _update_progress(progress: dict, page: list):
+    """Met à jour l'avancement d'un crawl après une page (position = timestamp du dernier item)"""
+    progress["pages"] += 1
+    progress["transfers"] += len(page)
+    if not page:
+        return
+    first = (page[0].get("sending") or {}).get("timestamp") or 0
+    last = (page[-1].get("sending") or {}).get("timestamp") or 0
+    if progress["pages"] == 1:
+        progress["descending"] = first >= last
+    progress["position"] = last
+    edge = progress["to_ts"] if progress["descending"] else progress["from_ts"]
+    span = max(1, progress["to_ts"] - progress["from_ts"])
+    progress["fraction"] = min(1.0, abs(edge - last) / span)
+
+def fetch_all(wallet: str, from_ts: int, to_ts: int, limit: int = 200, raise_errors: bool = False,
+              on_page=None, cancel=None, integrator: str = None):
+    """Récupère toutes les transactions via l'API (raise_errors : propage l'erreur au lieu de tronquer)
+    on_page(items, progress) est appelé après chaque page ; cancel (threading.Event) arrête le crawl
+    en gardant les pages déjà reçues ; integrator remplace INTEGRATOR pour ce crawl"""
+    params = transfer_params(wallet, from_ts, to_ts, limit, integrator)
     out = []
     next_cursor = None
-    session = requests.Session()
+    progress = new_progress(from_ts, to_ts)
     
     print("🔥 Récupération des transactions...")
     while True:
@@ -108,21 +365,60 @@ def fetch_all(wallet: str, from_ts: int, to_ts: int, limit: int = 200):
             params.pop("next", None)
         
         try:
-            r = session.get(API_URL, params=params, timeout=30)
-            r.raise_for_status()
-            data = r.json()
-            out.extend(data.get("data", []))
-            
-            if not data.get("hasNext"):
-                break
-            next_cursor = data.get("next")
-            time.sleep(0.1)
+            r = api_get(API_URL, params)
+            data = decode_json(r)
         except Exception as e:
             print(f"❌ Erreur lors de la récupération: {e}")
+            if raise_errors:
+                raise
+            break
+        
+        page = data.get("data", [])
+        out.extend(page)
+        if on_page is not None:
+            _update_progress(progress, page)
+            on_page(page, progress)
+        
+        if not data.get("hasNext"):
             break
+        if cancel is not None and cancel.is_set():
+            print(f"⏹️ Récupération interrompue après {len(out)} transfert(s)")
+            break
+        next_cursor = data.get("next")
+        if cancel is not None:
+            cancel.wait(PAGE_DELAY)
+        else:
+            time.sleep(PAGE_DELAY)
     
     return out
 
+def fetch_status(tx_hash: str, session=None) -> dict:
+    """Récupère l'état courant d'un transfert via l'endpoint de statut"""
+    try:
+        r = api_get(STATUS_URL, {"txHash": tx_hash}, session)
+        return decode_json(r)
+    except Exception as e:
+        print(f"❌ Erreur lors de la récupération du statut {shorten_tx(tx_hash)}: {e}")
+        return {}
+
+def leg_amounts(leg: dict) -> tuple:
+    """(unités de base, décimales, montant, valeur USD ou None) d'une jambe de transfert"""
+    token = leg.get("token") or {}
+    units = to_units(leg.get("amount"))
+    decimals = token.get("decimals")
+    try:
+        decimals = int(decimals)
+    except (TypeError, ValueError):
+        decimals = None
+    if units is None or decimals is None:
+        return units, decimals, 0.0, None
+    amount = units_to_float(units, decimals)
+    try:
+        usd = amount * float(token.get("priceUSD") or 0)
+    except (TypeError, ValueError):
+        usd = None
+    return units, decimals, amount, usd
+
 def build_transaction_dict(item: dict, chain_map: dict) -> dict:
     """Construit un dictionnaire de transaction structuré"""
     sending = item.get("sending", {}) or {}
@@ -131,69 +427,175 @@ def build_transaction_dict(item: dict, chain_map: dict) -> dict:
     shash = sending.get("txHash") or receiving.get("txHash")
     when_ts = sending.get("timestamp") or receiving.get("timestamp") or 0
     
-    # From
-    s_amt = amt_fmt(sending.get("amount"), (sending.get("token") or {}).get("decimals"))
+    s_units, s_dec, s_amount, s_usd = leg_amounts(sending)
     s_tok = (sending.get("token") or {}).get("symbol") or ""
     s_chain = chain_map.get(sending.get("chainId"), f"Chain {sending.get('chainId')}")
-    s_usd = None
-    try:
-        s_price = float((sending.get("token") or {}).get("priceUSD") or 0)
-        if sending.get("amount") and (sending.get("token") or {}).get("decimals") is not None:
-            s_usd = (int(sending["amount"]) / (10 ** (sending["token"]["decimals"]))) * s_price
-    except:
-        pass
-    
-    # To
-    r_amt = amt_fmt(receiving.get("amount"), (receiving.get("token") or {}).get("decimals"))
+    
+    r_units, r_dec, r_amount, r_usd = leg_amounts(receiving)
     r_tok = (receiving.get("token") or {}).get("symbol") or ""
     r_chain = chain_map.get(receiving.get("chainId"), f"Chain {receiving.get('chainId')}")
-    r_usd = None
-    try:
-        r_price = float((receiving.get("token") or {}).get("priceUSD") or 0)
-        if receiving.get("amount") and (receiving.get("token") or {}).get("decimals") is not None:
-            r_usd = (int(receiving["amount"]) / (10 ** (receiving["token"]["decimals"]))) * r_price
-    except:
-        pass
     
     return {
         'tx_id': shorten_tx(shash),
+        'tx_hash': shash or item.get("transactionId") or "",
+        'status': item.get("status") or "",
         'timestamp': int(when_ts),
+        'from_tx_hash': sending.get("txHash") or "",
+        'from_timestamp': int(sending.get("timestamp") or 0),
+        'to_tx_hash': receiving.get("txHash") or "",
+        'to_timestamp': int(receiving.get("timestamp") or 0),
         'from_token': s_tok,
         'from_blockchain': s_chain,
-        'from_amount': float(s_amt.replace(" ", "")),
+        'from_chain_id': sending.get("chainId"),
+        'from_amount': s_amount,
+        'from_units': s_units,
+        'from_decimals': s_dec,
         'to_token': r_tok,
         'to_blockchain': r_chain,
-        'to_amount': float(r_amt.replace(" ", "")),
+        'to_chain_id': receiving.get("chainId"),
+        'to_amount': r_amount,
+        'to_units': r_units,
+        'to_decimals': r_dec,
         'usd_value': s_usd or r_usd or 0,
         'platform': tool
     }
 
-def fetch_and_process_data(from_date: str, chain_map: dict):
-    """Récupère et traite les données de transactions (en mémoire)"""
-    from_ts = to_unix(from_date)
-    to_ts = int(dt.datetime.now(dt.timezone.utc).timestamp())
-    
-    raw_data = fetch_all(WALLET, from_ts, to_ts, limit=200)
-    raw_data.sort(key=lambda x: (x.get("sending", {}) or {}).get("timestamp", 0), reverse=True)
-    
+def settlement_latency(tx: dict):
+    """Délai (s) entre l'envoi et la réception d'un bridge terminé, None si inconnu"""
+    if tx.get('status') != "DONE" or tx['from_blockchain'] == tx['to_blockchain']:
+        return None
+    sent, received = tx.get('from_timestamp'), tx.get('to_timestamp')
+    if not sent or not received:
+        return None
+    return max(0, received - sent)
+
+def normalize_items(items: list, chain_map: dict) -> list:
+    """Normalise des items bruts, en ignorant ceux qui ne peuvent pas l'être"""
     transactions = []
-    for item in raw_data:
+    for item in items:
         try:
-            tx = build_transaction_dict(item, chain_map)
-            if tx['tx_id'] and tx['from_token'] and tx['to_token']:
-                transactions.append(tx)
-        except:
+            transactions.append(build_transaction_dict(item, chain_map))
+        except Exception:
             continue
-    
-    print(f"✅ {len(transactions)} transactions récupérées et traitées")
     return transactions
 
+# ==================== SÉRIES TEMPORELLES ====================
+BUCKET_WIDTHS = (60, 300, 900, 3600, 4 * 3600, 12 * 3600, 86400, 7 * 86400, 30 * 86400)
+
+def choose_bucket_width(start_ts: int, end_ts: int, max_points: int = CHART_MAX_POINTS) -> int:
+    """Choisit la plus petite largeur de bucket (en secondes) gardant la série sous max_points"""
+    for width in BUCKET_WIDTHS:
+        if end_ts // width - start_ts // width + 1 <= max_points:
+            return width
+    # Au-delà de 30 jours par bucket : largeur calculée directement
+    width = (end_ts - start_ts) // max_points + 1
+    while end_ts // width - start_ts // width + 1 > max_points:
+        width += 1
+    return width
+
+def bucketize(transactions: list, value_key: str = "usd_value", max_points: int = CHART_MAX_POINTS) -> list:
+    """Agrège les transactions en buckets temporels (nombre, somme, min, max) côté serveur"""
+    stamps = [tx["timestamp"] for tx in transactions if tx.get("timestamp")]
+    if not stamps:
+        return []
+    width = choose_bucket_width(min(stamps), max(stamps), max_points)
+
+    buckets = {}
+    for tx in transactions:
+        ts = tx.get("timestamp")
+        if not ts:
+            continue
+        value = float(tx.get(value_key) or 0)
+        b = buckets.get(ts // width)
+        if b is None:
+            buckets[ts // width] = [1, value, value, value]
+        else:
+            b[0] += 1
+            b[1] += value
+            if value < b[2]:
+                b[2] = value
+            if value > b[3]:
+                b[3] = value
+
+    return [
+        {"timestamp": k * width, "width": width, "count": b[0], "sum": b[1], "min": b[2], "max": b[3]}
+        for k, b in sorted(buckets.items())
+    ]
+
+# ==================== DISTRIBUTIONS (SKETCHES) ====================
+SKETCH_ACCURACY = 0.01  # Erreur relative maximale des quantiles (1 %)
+
+class QuantileSketch:
+    """Sketch de quantiles à buckets logarithmiques (type DDSketch) : mémoire constante, fusionnable, retrait possible"""
+    def __init__(self, accuracy: float = SKETCH_ACCURACY):
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = defaultdict(int)  # index -> nombre de valeurs
+        self.zeros = 0                    # Valeurs nulles (ou négatives)
+        self.count = 0
+    
+    def add(self, value: float, count: int = 1):
+        """Ajoute (count > 0) ou retire (count < 0) une valeur"""
+        self.count += count
+        if value <= 0:
+            self.zeros += count
+            return
+        idx = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[idx] += count
+        if self.buckets[idx] <= 0:
+            del self.buckets[idx]
+    
+    def merge(self, other: "QuantileSketch"):
+        """Fusionne un autre sketch de même précision"""
+        self.count += other.count
+        self.zeros += other.zeros
+        for idx, n in other.buckets.items():
+            self.buckets[idx] += n
+        return self
+    
+    def value_of(self, idx: int) -> float:
+        """Valeur représentative d'un bucket"""
+        return 2 * self.gamma ** idx / (self.gamma + 1)
+    
+    def quantile(self, q: float) -> float:
+        """Quantile q (0..1), à SKETCH_ACCURACY près en relatif"""
+        if self.count <= 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if rank < seen:
+                return self.value_of(idx)
+        return self.value_of(max(self.buckets)) if self.buckets else 0.0
+    
+    def histogram(self) -> list:
+        """Histogramme par décade ($0, <$1, $1-10, $10-100, ...) : [(borne_basse, borne_haute, nombre)]"""
+        decades = defaultdict(int)
+        for idx, n in self.buckets.items():
+            decades[math.floor(math.log10(self.value_of(idx)))] += n
+        bins = [(0.0, 0.0, self.zeros)] if self.zeros else []
+        bins += [(10.0 ** d, 10.0 ** (d + 1), decades[d]) for d in sorted(decades)]
+        return bins
+
 # ==================== ANALYSE DES DONNÉES ====================
 class TransactionAnalyzer:
     def __init__(self):
         self.transactions = []
+        self.positions = {}  # id(transaction) -> indice dans self.transactions (reconstruit au dépickling)
         self.platforms = defaultdict(int)
         self.blockchains = set()
+        self.chain_counts = defaultdict(int)
+        self.sizes = QuantileSketch()                      # Tailles USD, tous transferts
+        self.platform_sizes = defaultdict(QuantileSketch)  # Par plateforme
+        self.route_sizes = defaultdict(QuantileSketch)     # Par route (chaîne source, chaîne destination)
+        self.latencies = QuantileSketch()                      # Délais de règlement des bridges (s)
+        self.platform_latencies = defaultdict(QuantileSketch)
+        self.route_latencies = defaultdict(QuantileSketch)
+        self.sent_units = defaultdict(int)      # (chaîne, token, décimales) -> unités de base envoyées (exact)
+        self.received_units = defaultdict(int)  # (chaîne, token, décimales) -> unités de base reçues (exact)
         self.bridges = 0
         self.swaps = 0
         self.bridge_value = 0.0
@@ -207,25 +609,141 @@ class TransactionAnalyzer:
             return False
         
         for tx in transactions:
-            self.blockchains.add(tx['from_blockchain'])
-            self.blockchains.add(tx['to_blockchain'])
-            
-            platform = tx.get('platform', 'Unknown Platform')
-            self.platforms[platform] += 1
-            
-            # Bridge vs Swap
-            if tx['from_blockchain'] == tx['to_blockchain']:
-                self.swaps += 1
-                self.swap_value += tx['usd_value']
-            else:
-                self.bridges += 1
-                self.bridge_value += tx['usd_value']
-            
-            self.total_value += tx['usd_value']
+            self._apply(tx, 1)
         
-        self.transactions = transactions
+        self.transactions = list(transactions)  # Liste propre : les retraits la modifient sur place
+        self.positions = {id(tx): i for i, tx in enumerate(self.transactions)}
         return True
     
+    def __getstate__(self):
+        return dict(self.__dict__, positions=None)  # Les id() ne survivent pas au pickling
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.positions = {id(tx): i for i, tx in enumerate(self.transactions)}
+    
+    def add_transaction(self, tx: dict):
+        """Ajoute une transaction aux totaux"""
+        self._apply(tx, 1)
+        self.positions[id(tx)] = len(self.transactions)
+        self.transactions.append(tx)
+    
+    def remove_transaction(self, tx: dict):
+        """Retire une transaction des totaux (en O(1) : la dernière transaction prend sa place)"""
+        self._apply(tx, -1)
+        i = self.positions.pop(id(tx), None)
+        if i is None:
+            return
+        last = self.transactions.pop()
+        if last is not tx:
+            self.transactions[i] = last
+            self.positions[id(last)] = i
+    
+    def replace_transaction(self, old: dict, new: dict):
+        """Remplace une transaction en corrigeant les totaux sur place"""
+        self._apply(old, -1)
+        self._apply(new, 1)
+        i = self.positions.pop(id(old), None)
+        if i is not None:
+            self.transactions[i] = new
+            self.positions[id(new)] = i
+    
+    def _apply(self, tx: dict, sign: int):
+        """Ajoute (sign=1) ou retire (sign=-1) la contribution d'une transaction"""
+        for chain in (tx['from_blockchain'], tx['to_blockchain']):
+            self.chain_counts[chain] += sign
+            if self.chain_counts[chain] > 0:
+                self.blockchains.add(chain)
+            else:
+                self.chain_counts.pop(chain)
+                self.blockchains.discard(chain)
+        
+        platform = tx.get('platform', 'Unknown Platform')
+        self.platforms[platform] += sign
+        if self.platforms[platform] <= 0:
+            self.platforms.pop(platform)
+        
+        # Bridge vs Swap
+        if tx['from_blockchain'] == tx['to_blockchain']:
+            self.swaps += sign
+            self.swap_value += sign * tx['usd_value']
+        else:
+            self.bridges += sign
+            self.bridge_value += sign * tx['usd_value']
+        
+        self.total_value += sign * tx['usd_value']
+        
+        # Distributions de tailles
+        self.sizes.add(tx['usd_value'], sign)
+        self.platform_sizes[platform].add(tx['usd_value'], sign)
+        route = (tx['from_blockchain'], tx['to_blockchain'])
+        self.route_sizes[route].add(tx['usd_value'], sign)
+        if self.platform_sizes[platform].count <= 0:
+            del self.platform_sizes[platform]
+        if self.route_sizes[route].count <= 0:
+            del self.route_sizes[route]
+        
+        # Totaux exacts par token, en unités de base entières
+        for totals, side in ((self.sent_units, "from"), (self.received_units, "to")):
+            units, decimals = tx.get(f'{side}_units'), tx.get(f'{side}_decimals')
+            if units is None or decimals is None:
+                continue
+            key = (tx[f'{side}_blockchain'], tx[f'{side}_token'], decimals)
+            totals[key] += sign * units
+            if not totals[key]:
+                del totals[key]
+        
+        # Délais de règlement (bridges terminés dont les deux jambes sont datées)
+        latency = settlement_latency(tx)
+        if latency is not None:
+            self.latencies.add(latency, sign)
+            self.platform_latencies[platform].add(latency, sign)
+            self.route_latencies[route].add(latency, sign)
+            if self.platform_latencies[platform].count <= 0:
+                del self.platform_latencies[platform]
+            if self.route_latencies[route].count <= 0:
+                del self.route_latencies[route]
+    
+    def size_stats(self, by: str = "platform") -> list:
+        """Médiane, p90 et p99 des tailles USD par plateforme ou par route"""
+        return self._sketch_stats(self.platform_sizes if by == "platform" else self.route_sizes, by)
+    
+    def latency_stats(self, by: str = "platform") -> list:
+        """Médiane, p90 et p99 des délais de règlement des bridges par plateforme ou par route"""
+        return self._sketch_stats(self.platform_latencies if by == "platform" else self.route_latencies, by)
+    
+    def token_totals(self) -> list:
+        """Volumes exacts par token et par chaîne, convertis ici seulement (envoyé / reçu)"""
+        rows = []
+        for key in self.sent_units.keys() | self.received_units.keys():
+            chain, token, decimals = key
+            sent, received = self.sent_units.get(key, 0), self.received_units.get(key, 0)
+            rows.append({
+                "blockchain": chain,
+                "token": token,
+                "decimals": decimals,
+                "sent_units": sent,
+                "received_units": received,
+                "sent": units_to_float(sent, decimals),
+                "received": units_to_float(received, decimals),
+            })
+        return sorted(rows, key=lambda r: (r["token"], r["blockchain"]))
+    
+    def _sketch_stats(self, sketches: dict, by: str) -> list:
+        """Lignes count / p50 / p90 / p99, une par clé"""
+        rows = []
+        for key, sketch in sketches.items():
+            if sketch.count <= 0:
+                continue
+            rows.append({
+                by: key if by == "platform" else f"{key[0]} → {key[1]}",
+                "count": sketch.count,
+                "p50": sketch.quantile(0.5),
+                "p90": sketch.quantile(0.9),
+                "p99": sketch.quantile(0.99),
+            })
+        return sorted(rows, key=lambda r: r["count"], reverse=True)
+    
     def print_results(self):
         """Affiche les résultats de l'analyse"""
         print("\n" + "=" * 60)
@@ -259,10 +777,197 @@ class TransactionAnalyzer:
             percentage = (count / len(self.transactions)) * 100
             print(f"   • {platform} : {count} transaction(s) ({percentage:.1f}%)")
         
+        print("\n📏 TAILLE DES TRANSFERTS (USD)")
+        print(f"   • Médiane : {usd_fmt(self.sizes.quantile(0.5))} • p90 : {usd_fmt(self.sizes.quantile(0.9))}"
+              f" • p99 : {usd_fmt(self.sizes.quantile(0.99))}")
+        for row in self.size_stats("platform"):
+            print(f"   • {row['platform']} : médiane {usd_fmt(row['p50'])} • p90 {usd_fmt(row['p90'])}"
+                  f" • p99 {usd_fmt(row['p99'])}")
+        
+        tokens = self.token_totals()
+        if tokens:
+            print("\n🪙 VOLUMES PAR TOKEN (exacts)")
+            for row in tokens:
+                print(f"   • {row['token']} ({row['blockchain']}) : envoyé {units_str(row['sent_units'], row['decimals'])}"
+                      f" • reçu {units_str(row['received_units'], row['decimals'])}")
+        
+        if self.latencies.count > 0:
+            print("\n⏱️ DÉLAI DE RÈGLEMENT DES BRIDGES")
+            print(f"   • Médiane : {duration_fmt(self.latencies.quantile(0.5))}"
+                  f" • p90 : {duration_fmt(self.latencies.quantile(0.9))}"
+                  f" • p99 : {duration_fmt(self.latencies.quantile(0.99))}")
+            for row in self.latency_stats("platform"):
+                print(f"   • {row['platform']} : médiane {duration_fmt(row['p50'])} • p90 {duration_fmt(row['p90'])}"
+                      f" • p99 {duration_fmt(row['p99'])} ({row['count']} bridges)")
+        
         print("=" * 60 + "\n")
 
+# ==================== SYNCHRONISATION INCRÉMENTALE ====================
+def is_valid_transaction(tx: dict) -> bool:
+    """Indique si une transaction normalisée est exploitable pour l'analyse"""
+    return bool(tx['tx_id'] and tx['from_token'] and tx['to_token'])
+
+class SyncState:
+    """État local d'une analyse : transferts connus, transferts non finalisés et dernière synchro"""
+    def __init__(self, wallet, chain_map: dict, store=None):
+        self.wallet = wallet
+        self.chain_map = chain_map
+        self.store = store    # TransferStore optionnel (jumper_store)
+        self.analyzer = TransactionAnalyzer()
+        self.by_hash = {}     # tx_hash -> transaction normalisée
+        self.by_leg = {}      # txHash de chaque jambe (envoi / réception) -> tx_hash
+        self.pending = set()  # tx_hash des transferts non finalisés
+        self.last_sync = 0    # toTimestamp de la dernière synchro
+        self.newest_ts = 0    # Timestamp du transfert le plus récent vu
+        self.stale = False    # True si servi depuis le cache faute d'API disponible
+        self.complete = True  # False si le dernier chargement a été interrompu
+    
+    def load(self, from_ts: int, to_ts: int = None, on_page=None, cancel=None) -> int:
+        """Récupération initiale de l'historique (depuis le cache local s'il est disponible)
+        Les pages sont intégrées au fil de l'eau ; on_page(progress) est appelé après chacune"""
+        to_ts = to_ts or int(dt.datetime.now(dt.timezone.utc).timestamp())
+        before = len(self.by_hash)
+        
+        def handle(transactions, progress):
+            self.ingest_transactions(transactions)
+            if on_page is not None:
+                on_page(progress)
+        
+        if self.store is not None:
+            try:
+                self.store.sync(self.wallet, self.chain_map, from_ts, to_ts, on_page=handle, cancel=cancel)
+                self.stale = False
+            except Exception as e:
+                print(f"⚠️ API indisponible ({e}), utilisation des données en cache")
+                self.stale = True
+            self.ingest_transactions(self.store.query(self.wallet, start=from_ts, end=to_ts))
+            if self.store.compacted_before(self.wallet) > from_ts:
+                print("⚠️ Période en partie compactée dans le cache : détail disponible seulement sur la fenêtre "
+                      "de rétention (totaux complets via TransferStore.summary)")
+        else:
+            fetch_all(self.wallet, from_ts, to_ts, limit=200, cancel=cancel,
+                      on_page=lambda items, progress: handle(normalize_items(items, self.chain_map), progress))
+        self.complete = not (cancel is not None and cancel.is_set())
+        self.last_sync = to_ts
+        return len(self.by_hash) - before
+    
+    def trimmed(self, from_ts: int) -> "SyncState":
+        """Copie restreinte aux transferts postérieurs à from_ts (ex. résultat matérialisé sur une période plus longue)"""
+        state = SyncState(self.wallet, self.chain_map, store=self.store)
+        state.ingest_transactions([tx for tx in self.by_hash.values() if tx['timestamp'] >= from_ts])
+        state.newest_ts = max(state.newest_ts, self.newest_ts)
+        state.last_sync = self.last_sync
+        state.stale = self.stale
+        state.complete = self.complete
+        return state
+    
+    def __getstate__(self):
+        """Sérialisable (résultats matérialisés) : le cache SQLite n'est pas embarqué"""
+        return dict(self.__dict__, store=None)
+    
+    def poll(self) -> int:
+        """Récupère uniquement les transferts postérieurs au plus récent déjà vu"""
+        to_ts = int(dt.datetime.now(dt.timezone.utc).timestamp())
+        changed = self.ingest(fetch_all(self.wallet, self.newest_ts or self.last_sync, to_ts, limit=200))
+        self.last_sync = to_ts
+        return changed
+    
+    def refresh(self) -> int:
+        """Re-interroge la nouvelle queue puis uniquement les transferts non finalisés"""
+        # La queue d'abord, les statuts (qui font foi) ensuite
+        changed = self.poll() + self.refresh_pending()
+        print(f"🔄 {len(self.pending)} transfert(s) en attente, {changed} mise(s) à jour")
+        return changed
+    
+    def refresh_pending(self) -> int:
+        """Re-interroge le statut des seuls transferts non finalisés"""
+        updates = []
+        for tx_hash in list(self.pending):
+            item = fetch_status(tx_hash)
+            if item:
+                updates.append(item)
+        return self.ingest(updates)
+    
+    def ingest(self, items: list) -> int:
+        """Intègre des items bruts en corrigeant les totaux de l'analyseur sur place"""
+        if items and not self.chain_map:
+            self.chain_map = fetch_chains()  # État servi depuis le cache sans liste des chaînes (API alors hors ligne)
+        transactions = normalize_items(items, self.chain_map)
+        changed = self.ingest_transactions(transactions)
+        if self.store is not None and transactions:
+            self.store.upsert(self.wallet, transactions)
+        return changed
+    
+    def lookup(self, tx_hash: str):
+        """Transfert connu à partir du hash de l'une ou l'autre de ses jambes"""
+        return self.by_hash.get(self.by_leg.get(tx_hash, tx_hash))
+    
+    def ingest_transactions(self, transactions: list) -> int:
+        """Intègre des transactions déjà normalisées"""
+        changed = 0
+        for tx in transactions:
+            key = tx['tx_hash']
+            if not key:
+                continue
+            self.newest_ts = max(self.newest_ts, tx['timestamp'])
+            
+            if tx['status'] in FINAL_STATUSES:
+                self.pending.discard(key)
+            else:
+                self.pending.add(key)
+            
+            old = self.by_hash.get(key)
+            if old == tx:
+                continue
+            if is_valid_transaction(tx):
+                if old is None:
+                    self.analyzer.add_transaction(tx)
+                else:
+                    self.analyzer.replace_transaction(old, tx)
+                self.by_hash[key] = tx
+                for leg in (tx.get('from_tx_hash'), tx.get('to_tx_hash')):
+                    if leg:
+                        self.by_leg[leg] = key
+            elif old is not None:
+                self.analyzer.remove_transaction(old)
+                del self.by_hash[key]
+            else:
+                continue
+            changed += 1
+        return changed
+
+def follow(state: SyncState, interval: int = FOLLOW_INTERVAL, on_update=None, max_polls: int = None):
+    """Mode suivi : scrute les nouveaux transferts à intervalle régulier et les intègre à l'analyse"""
+    print(f"👀 Mode suivi actif (toutes les {interval}s, Ctrl+C pour arrêter)")
+    polls = 0
+    try:
+        while max_polls is None or polls < max_polls:
+            time.sleep(interval)
+            changed = state.poll()
+            polls += 1
+            if changed:
+                a = state.analyzer
+                print(f"🆕 {changed} nouveau(x) transfert(s) • total {len(a.transactions)} • "
+                      f"bridges ${a.bridge_value:,.2f} • swaps ${a.swap_value:,.2f}")
+                if on_update:
+                    on_update(state)
+    except KeyboardInterrupt:
+        print("\n⏹️ Mode suivi arrêté")
+
 # ==================== FONCTION PRINCIPALE ====================
 def main():
+    parser = argparse.ArgumentParser(description="Analyse des volumes Jumper Exchange")
+    parser.add_argument("--from-date", help="Date de début (YYYY-MM-DD)")
+    parser.add_argument("--wallet", default=WALLET, help="Adresse du wallet (tout l'intégrateur par défaut)")
+    parser.add_argument("--follow", type=int, nargs="?", const=FOLLOW_INTERVAL, metavar="SECONDES",
+                        help="Reste actif et intègre les nouveaux transferts à intervalle régulier")
+    parser.add_argument("--archive", metavar="DOSSIER", help="Archive les réponses brutes (rejouables hors ligne)")
+    args = parser.parse_args()
+    
+    if args.archive:
+        import jumper_archive
+        jumper_archive.PageArchive(args.archive).attach()
+    
     print("\n" + "=" * 60)
     print("🚀 JUMPER VOLUME ANALYZER - Version Mémoire")
     print("=" * 60)
@@ -275,19 +980,35 @@ def main():
         return
     
     # Demande de la date de début
-    from_date = input("\n📅 Date de début (YYYY-MM-DD): ").strip()
+    from_date = args.from_date or input("\n📅 Date de début (YYYY-MM-DD): ").strip()
     
     # Récupération et traitement des transactions (en mémoire)
-    transactions = fetch_and_process_data(from_date, chain_map)
+    state = SyncState(args.wallet, chain_map)
+    
+    def show_progress(progress):
+        position = progress["position"]
+        when = dt.datetime.fromtimestamp(position, tz=dt.timezone.utc).strftime("%d %b %Y") if position else "-"
+        print(f"\r📄 {progress['pages']} page(s) • {progress['transfers']} transfert(s) • "
+              f"{progress['fraction']:.0%} • {when}   ", end="", flush=True)
     
-    if not transactions:
+    try:
+        state.load(to_unix(from_date), on_page=show_progress)
+        print()
+    except KeyboardInterrupt:
+        print("\n⏹️ Récupération interrompue, analyse des transferts déjà reçus")
+    transactions = state.analyzer.transactions
+    print(f"✅ {len(transactions)} transactions récupérées et traitées")
+    
+    if not transactions and not args.follow:
         print("❌ Aucune transaction trouvée!")
         return
     
     # Analyse des transactions
-    analyzer = TransactionAnalyzer()
-    if analyzer.analyze_transactions(transactions):
-        analyzer.print_results()
+    if transactions:
+        state.analyzer.print_results()
+    
+    if args.follow:
+        follow(state, args.follow)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
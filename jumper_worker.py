@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Worker de matérialisation en arrière-plan pour une liste de wallets suivis
+Synchro incrémentale du cache + analyse à intervalle régulier ; le dashboard lit directement le résultat
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import jumper_batch as jb
+import jumper_store as js
+import jumper_volume as jv
+
+# ==================== CONFIGURATION ====================
+WORKER_INTERVAL = 600  # Secondes entre deux passes sur la liste de suivi
+WORKER_THREADS = 4     # Wallets matérialisés simultanément
+
+# ==================== MATÉRIALISATION ====================
+class Worker:
+    """Planificateur : une passe par intervalle, un SyncState conservé en mémoire par wallet"""
+    def __init__(self, store: js.TransferStore, wallets: list, from_ts: int, chain_map: dict,
+                 interval: int = WORKER_INTERVAL, threads: int = WORKER_THREADS):
+        self.store = store
+        self.wallets = list(dict.fromkeys(wallets))
+        self.from_ts = from_ts
+        self.chain_map = chain_map
+        self.interval = interval
+        self.threads = threads
+        self.states = {}  # wallet -> SyncState
+
+    def state_for(self, wallet) -> jv.SyncState:
+        """État en mémoire, sinon repris du dernier résultat matérialisé"""
+        state = self.states.get(wallet)
+        if state is None:
+            state, _ = self.store.load_materialized(wallet, self.from_ts)
+            state = state or jv.SyncState(wallet, self.chain_map, store=self.store)
+            self.states[wallet] = state
+        return state
+
+    def materialize(self, wallet, next_run: float = None) -> dict:
+        """Synchro incrémentale d'un wallet puis écriture du résultat matérialisé"""
+        started = time.time()
+        t0 = time.perf_counter()
+        state = self.state_for(wallet)
+        error = None
+        try:
+            # Seule la queue postérieure à la dernière synchro passe par l'API
+            state.load(state.last_sync or self.from_ts)
+            if state.stale:
+                raise RuntimeError("API indisponible")
+            state.refresh_pending()
+            self.store.save_materialized(state, self.from_ts)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        duration = time.perf_counter() - t0
+        self.store.record_run(wallet, started, duration, len(state.analyzer.transactions), error, next_run)
+        return {"wallet": wallet, "duration": duration, "transactions": len(state.analyzer.transactions),
+                "error": error}
+
+    def run_once(self, next_run: float = None) -> list:
+        """Une passe complète sur la liste de suivi"""
+        with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="jumper-worker") as pool:
+            return list(pool.map(lambda w: self.materialize(w, next_run), self.wallets))
+
+    def run(self, max_runs: int = None):
+        """Boucle du planificateur (Ctrl+C pour arrêter)"""
+        runs = 0
+        while max_runs is None or runs < max_runs:
+            started = time.time()
+            next_run = started + self.interval
+            print(f"\n🛠️ Passe {runs + 1} : {len(self.wallets)} wallet(s)")
+            for row in self.run_once(next_run):
+                status = f"❌ {row['error']}" if row["error"] else "✅"
+                print(f"   {row['wallet']:<44} {row['transactions']:>6} tx  {row['duration']:>6.1f}s  {status}")
+            # Compaction incrémentale du cache : quelques jours par périmètre à chaque passe
+            compacted = self.store.compact()
+            if compacted:
+                print(f"   📦 {compacted} ligne(s) compactée(s) en agrégats journaliers")
+            runs += 1
+            if max_runs is not None and runs >= max_runs:
+                break
+            time.sleep(max(0.0, next_run - time.time()))
+
+def print_status(store: js.TransferStore):
+    """État du planificateur et ancienneté des résultats par wallet"""
+    rows = store.worker_status()
+    if not rows:
+        print("ℹ️ Aucune exécution du worker enregistrée")
+        return
+    now = time.time()
+    print(f"\n{'WALLET':<44} {'TX':>6} {'DURÉE':>7} {'ÂGE':>8} {'PROCHAINE':>10}  ÉTAT")
+    for row in rows:
+        age = f"{row['staleness'] / 60:.0f} min" if row["staleness"] is not None else "-"
+        upcoming = f"{max(0, row['next_run'] - now) / 60:.0f} min" if row["next_run"] else "-"
+        status = "✅" if row["ok"] else f"❌ {row['error']}"
+        print(f"{row['wallet']:<44} {row['transactions'] or 0:>6} {row['duration']:>6.1f}s {age:>8} {upcoming:>10}  {status}")
+
+# ==================== FONCTION PRINCIPALE ====================
+def main():
+    parser = argparse.ArgumentParser(description="Matérialisation périodique des analyses d'une liste de wallets")
+    parser.add_argument("wallets", nargs="?", help="Fichier de wallets suivis (une adresse par ligne)")
+    parser.add_argument("--from-date", help="Date de début de l'analyse (YYYY-MM-DD)")
+    parser.add_argument("--interval", type=int, default=WORKER_INTERVAL, help="Secondes entre deux passes")
+    parser.add_argument("--threads", type=int, default=WORKER_THREADS, help="Wallets traités simultanément")
+    parser.add_argument("--once", action="store_true", help="Une seule passe puis arrêt")
+    parser.add_argument("--status", action="store_true", help="Affiche l'état du worker et quitte")
+    parser.add_argument("--store", default=js.STORE_PATH, help="Chemin du cache SQLite")
+    args = parser.parse_args()
+
+    store = js.TransferStore(args.store)
+    if args.status:
+        print_status(store)
+        return
+    if not args.wallets or not args.from_date:
+        parser.error("wallets et --from-date sont requis (sauf avec --status)")
+
+    wallets = jb.read_wallets(args.wallets)
+    if not wallets:
+        print("❌ Aucun wallet valide!")
+        return
+
+    chain_map = jv.fetch_chains()
+    if not chain_map:
+        print("❌ Impossible de récupérer la liste des blockchains!")
+        return
+
+    worker = Worker(store, wallets, jv.to_unix(args.from_date), chain_map, args.interval, args.threads)
+    print(f"🛠️ Worker actif : {len(worker.wallets)} wallet(s) depuis le {args.from_date}, "
+          f"toutes les {args.interval}s")
+    try:
+        worker.run(max_runs=1 if args.once else None)
+    except KeyboardInterrupt:
+        print("\n⏹️ Worker arrêté")
+    print_status(store)
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,21 @@
 #  by CURTIS_XBT
 # =========================
 import datetime as dt
+import hashlib
+import html
+import os
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
 
+import jumper_archive as ja
+import jumper_cohort as jc
+import jumper_store as js
 import jumper_volume as jv
 
 PRIMARY = "#C1A5EC"
-SECONDARY = "#8B7AB8"
 ACCENT = "#E8DEFF"
-DARK = "#0A0A0F"
-DARKER = "#050508"
 
 st.set_page_config(
     page_title="Jumper Analytics",
@@ -23,624 +27,23 @@ st.set_page_config(
 )
 
 # --------- PREMIUM CSS ---------
-st.markdown(f"""
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800;900&display=swap');
-
-* {{
-  font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-}}
-
-:root {{
-  --primary: {PRIMARY};
-  --secondary: {SECONDARY};
-  --accent: {ACCENT};
-  --dark: {DARK};
-  --darker: {DARKER};
-}}
-
-html[data-theme="light"] {{
-  --text-primary: #0A0A0F;
-  --text-muted: #444444;
-  --text-button: #0A0A0F;
-  --bg-card: rgba(0,0,0,0.04);
-  --border-card: rgba(0,0,0,0.12);
-  --input-bg: rgba(0,0,0,0.05);
-  --input-border: rgba(0,0,0,0.2);
-}}
-
-html[data-theme="dark"] {{
-  --text-primary: #FFFFFF;
-  --text-muted: rgba(255,255,255,0.65);
-  --text-button: #FFFFFF;
-  --bg-card: rgba(255,255,255,0.08);
-  --border-card: rgba(255,255,255,0.12);
-  --input-bg: rgba(255,255,255,0.08);
-  --input-border: rgba(193,165,236,0.25);
-}}
-
-[data-testid="stAppViewContainer"] {{
-  background: 
-    radial-gradient(ellipse 1400px 900px at 20% 0%, rgba(193,165,236,0.15), transparent),
-    radial-gradient(ellipse 1200px 700px at 80% 100%, rgba(139,122,184,0.12), transparent),
-    radial-gradient(circle 800px at 50% 50%, rgba(193,165,236,0.05), transparent),
-    linear-gradient(180deg, {DARKER} 0%, {DARK} 100%);
-  color: var(--text-primary);
-  min-height: 100vh;
-}}
-
-html[data-theme="light"] [data-testid="stAppViewContainer"] {{
-  background: 
-    radial-gradient(ellipse 1400px 900px at 20% 0%, rgba(193,165,236,0.08), transparent),
-    radial-gradient(ellipse 1200px 700px at 80% 100%, rgba(139,122,184,0.06), transparent),
-    linear-gradient(180deg, #FAFAFA 0%, #F5F5F5 100%);
-}}
-
-.block-container {{
-  padding: 2rem 3rem 3rem;
-  max-width: 1400px;
-}}
-
-.hero-container {{
-  margin-bottom: 3rem;
-  position: relative;
-}}
-
-.badge {{
-  display: inline-flex;
-  align-items: center;
-  gap: 8px;
-  padding: 8px 18px;
-  background: linear-gradient(135deg, rgba(255,255,255,0.12), rgba(193,165,236,0.15));
-  border: 1px solid rgba(193,165,236,0.3);
-  border-radius: 50px;
-  font-size: 0.85rem;
-  font-weight: 600;
-  letter-spacing: 0.5px;
-  backdrop-filter: blur(20px);
-  box-shadow: 0 4px 20px rgba(193,165,236,0.15);
-  margin-bottom: 1.5rem;
-}}
-
-html[data-theme="light"] .badge {{
-  background: linear-gradient(135deg, rgba(193,165,236,0.15), rgba(193,165,236,0.25));
-  border: 1px solid rgba(193,165,236,0.4);
-}}
-
-.badge::before {{
-  content: '';
-  width: 8px;
-  height: 8px;
-  background: linear-gradient(135deg, {PRIMARY}, {ACCENT});
-  border-radius: 50%;
-  box-shadow: 0 0 12px {PRIMARY};
-  animation: pulse 2s infinite;
-}}
-
-@keyframes pulse {{
-  0%, 100% {{ opacity: 1; transform: scale(1); }}
-  50% {{ opacity: 0.6; transform: scale(0.85); }}
-}}
-
-h1.hero-title {{
-  font-size: clamp(3rem, 8vw, 5.5rem);
-  font-weight: 900;
-  line-height: 1;
-  margin: 0 0 1rem 0;
-  background: linear-gradient(135deg, #FFFFFF 0%, {PRIMARY} 50%, {ACCENT} 100%);
-  -webkit-background-clip: text;
-  background-clip: text;
-  color: transparent;
-  letter-spacing: -0.03em;
-  text-shadow: 0 0 80px rgba(193,165,236,0.3);
-}}
-
-html[data-theme="light"] h1.hero-title {{
-  background: linear-gradient(135deg, #0A0A0F 0%, {SECONDARY} 50%, {PRIMARY} 100%);
-  -webkit-background-clip: text;
-  background-clip: text;
-  color: transparent;
-}}
-
-.hero-subtitle {{
-  font-size: 1.25rem;
-  color: var(--text-muted);
-  font-weight: 500;
-  line-height: 1.6;
-  max-width: 600px;
-}}
-
-.glass-card {{
-  background: linear-gradient(135deg, 
-    var(--bg-card) 0%, 
-    rgba(193,165,236,0.05) 100%);
-  border: 1px solid var(--border-card);
-  border-radius: 24px;
-  padding: 2rem;
-  backdrop-filter: blur(20px);
-  box-shadow: 
-    0 8px 32px rgba(0,0,0,0.3),
-    inset 0 1px 0 rgba(255,255,255,0.1);
-  transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-  position: relative;
-  overflow: hidden;
-}}
-
-html[data-theme="light"] .glass-card {{
-  box-shadow: 
-    0 8px 32px rgba(0,0,0,0.08),
-    inset 0 1px 0 rgba(255,255,255,0.5);
-}}
-
-.glass-card::before {{
-  content: '';
-  position: absolute;
-  top: 0;
-  left: 0;
-  right: 0;
-  height: 1px;
-  background: linear-gradient(90deg, 
-    transparent, 
-    rgba(193,165,236,0.5), 
-    transparent);
-}}
-
-.glass-card:hover {{
-  transform: translateY(-4px);
-  border-color: rgba(193,165,236,0.4);
-  box-shadow: 
-    0 16px 48px rgba(193,165,236,0.2),
-    inset 0 1px 0 rgba(255,255,255,0.15);
-}}
-
-html[data-theme="light"] .glass-card:hover {{
-  box-shadow: 
-    0 16px 48px rgba(193,165,236,0.15),
-    inset 0 1px 0 rgba(255,255,255,0.8);
-}}
-
-.kpi-grid {{
-  display: grid;
-  grid-template-columns: repeat(3, 1fr);
-  gap: 1.5rem;
-  margin: 2.5rem 0;
-}}
-
-@media (max-width: 968px) {{
-  .kpi-grid {{
-    grid-template-columns: 1fr;
-  }}
-}}
-
-.kpi-card {{
-  background: linear-gradient(135deg, 
-    rgba(193,165,236,0.12) 0%, 
-    rgba(139,122,184,0.08) 100%);
-  border: 1.5px solid rgba(193,165,236,0.25);
-  border-radius: 28px;
-  padding: 2rem 1.75rem;
-  backdrop-filter: blur(20px);
-  box-shadow: 
-    0 12px 40px rgba(193,165,236,0.15),
-    inset 0 1px 0 rgba(255,255,255,0.1);
-  transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);
-  position: relative;
-  overflow: hidden;
-}}
-
-html[data-theme="light"] .kpi-card {{
-  background: linear-gradient(135deg, 
-    rgba(193,165,236,0.12) 0%, 
-    rgba(139,122,184,0.10) 100%);
-  border: 1.5px solid rgba(193,165,236,0.3);
-  box-shadow: 
-    0 12px 40px rgba(193,165,236,0.1),
-    inset 0 1px 0 rgba(255,255,255,0.5);
-}}
-
-.kpi-card::after {{
-  content: '';
-  position: absolute;
-  top: -50%;
-  right: -50%;
-  width: 200%;
-  height: 200%;
-  background: radial-gradient(circle, rgba(193,165,236,0.15) 0%, transparent 70%);
-  opacity: 0;
-  transition: opacity 0.4s;
-}}
-
-.kpi-card:hover {{
-  transform: translateY(-6px) scale(1.02);
-  border-color: rgba(193,165,236,0.5);
-  box-shadow: 
-    0 20px 60px rgba(193,165,236,0.3),
-    inset 0 1px 0 rgba(255,255,255,0.2);
-}}
-
-html[data-theme="light"] .kpi-card:hover {{
-  box-shadow: 
-    0 20px 60px rgba(193,165,236,0.2),
-    inset 0 1px 0 rgba(255,255,255,0.8);
-}}
-
-.kpi-card:hover::after {{
-  opacity: 1;
-}}
-
-.kpi-label {{
-  font-size: 0.9rem;
-  font-weight: 600;
-  color: var(--text-muted);
-  text-transform: uppercase;
-  letter-spacing: 1.5px;
-  margin-bottom: 0.75rem;
-}}
-
-.kpi-value {{
-  font-size: clamp(2rem, 4vw, 3.5rem);
-  font-weight: 900;
-  background: linear-gradient(135deg, #FFFFFF 0%, {PRIMARY} 100%);
-  -webkit-background-clip: text;
-  background-clip: text;
-  color: transparent;
-  line-height: 1.1;
-  letter-spacing: -0.02em;
-  white-space: nowrap;
-  overflow: hidden;
-  text-overflow: clip;
-}}
-
-html[data-theme="light"] .kpi-value {{
-  background: linear-gradient(135deg, #0A0A0F 0%, {SECONDARY} 100%);
-  -webkit-background-clip: text;
-  background-clip: text;
-  color: transparent;
-}}
-
-.kpi-icon {{
-  position: absolute;
-  top: 1.5rem;
-  right: 1.5rem;
-  font-size: 2.5rem;
-  opacity: 0.35;
-  filter: drop-shadow(0 0 8px rgba(193,165,236,0.4));
-}}
-
-.blockchain-counter {{
-  text-align: center;
-  margin: 2.5rem 0;
-  padding: 2rem;
-  background: linear-gradient(135deg, 
-    rgba(193,165,236,0.08) 0%, 
-    rgba(139,122,184,0.05) 100%);
-  border: 1px solid rgba(193,165,236,0.2);
-  border-radius: 24px;
-  backdrop-filter: blur(20px);
-}}
-
-html[data-theme="light"] .blockchain-counter {{
-  background: linear-gradient(135deg, 
-    rgba(193,165,236,0.10) 0%, 
-    rgba(139,122,184,0.08) 100%);
-  border: 1px solid rgba(193,165,236,0.3);
-}}
-
-.blockchain-counter-label {{
-  font-size: 0.95rem;
-  font-weight: 600;
-  color: var(--text-muted);
-  text-transform: uppercase;
-  letter-spacing: 2px;
-  margin-bottom: 0.5rem;
-}}
-
-.blockchain-counter-value {{
-  font-size: clamp(2rem, 5vw, 3rem);
-  font-weight: 900;
-  background: linear-gradient(135deg, #FFFFFF 0%, {PRIMARY} 100%);
-  -webkit-background-clip: text;
-  background-clip: text;
-  color: transparent;
-  letter-spacing: -0.02em;
-}}
-
-html[data-theme="light"] .blockchain-counter-value {{
-  background: linear-gradient(135deg, #0A0A0F 0%, {SECONDARY} 100%);
-  -webkit-background-clip: text;
-  background-clip: text;
-  color: transparent;
-}}
-
-.chain-badges {{
-  display: flex;
-  flex-wrap: wrap;
-  gap: 1rem;
-  margin: 1.5rem 0;
-}}
-
-.chain-badge {{
-  display: inline-flex;
-  align-items: center;
-  gap: 10px;
-  padding: 1rem 1.5rem;
-  background: linear-gradient(135deg, rgba(193,165,236,0.15), rgba(139,122,184,0.1));
-  border: 1.5px solid rgba(193,165,236,0.3);
-  border-radius: 16px;
-  backdrop-filter: blur(20px);
-  transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-  box-shadow: 0 4px 16px rgba(193,165,236,0.1);
-}}
-
-html[data-theme="light"] .chain-badge {{
-  background: linear-gradient(135deg, rgba(193,165,236,0.15), rgba(139,122,184,0.12));
-  border: 1.5px solid rgba(193,165,236,0.35);
-}}
-
-.chain-badge:hover {{
-  transform: translateY(-3px);
-  border-color: rgba(193,165,236,0.6);
-  box-shadow: 0 8px 24px rgba(193,165,236,0.25);
-  background: linear-gradient(135deg, rgba(193,165,236,0.22), rgba(139,122,184,0.15));
-}}
-
-.chain-badge-icon {{
-  width: 32px;
-  height: 32px;
-  border-radius: 50%;
-  background: linear-gradient(135deg, {PRIMARY}, {SECONDARY});
-  display: flex;
-  align-items: center;
-  justify-content: center;
-  font-weight: 700;
-  font-size: 0.9rem;
-  color: #FFF;
-  box-shadow: 0 4px 12px rgba(193,165,236,0.3);
-}}
-
-.chain-badge-name {{
-  font-weight: 600;
-  font-size: 1rem;
-  color: var(--text-primary);
-  letter-spacing: 0.3px;
-}}
-
-.chain-badge-count {{
-  font-size: 0.85rem;
-  color: var(--text-muted);
-  font-weight: 500;
-}}
-
-html[data-theme="light"] .stTextInput > div > div > input,
-html[data-theme="light"] .stDateInput > div > div > input {{
-  background: rgba(0,0,0,0.05) !important;
-  border: 1.5px solid rgba(0,0,0,0.2) !important;
-  border-radius: 16px !important;
-  color: #0A0A0F !important;
-  padding: 0.9rem 1.2rem !important;
-  font-size: 1rem !important;
-  font-weight: 500 !important;
-  transition: all 0.3s !important;
-  backdrop-filter: blur(10px) !important;
-}}
-
-html[data-theme="dark"] .stTextInput > div > div > input,
-html[data-theme="dark"] .stDateInput > div > div > input {{
-  background: rgba(255,255,255,0.08) !important;
-  border: 1.5px solid rgba(193,165,236,0.25) !important;
-  border-radius: 16px !important;
-  color: #FFFFFF !important;
-  padding: 0.9rem 1.2rem !important;
-  font-size: 1rem !important;
-  font-weight: 500 !important;
-  transition: all 0.3s !important;
-  backdrop-filter: blur(10px) !important;
-}}
-
-.stTextInput > div > div > input:focus,
-.stDateInput > div > div > input:focus {{
-  border-color: {PRIMARY} !important;
-  box-shadow: 0 0 0 3px rgba(193,165,236,0.15) !important;
-  background: rgba(255,255,255,0.12) !important;
-}}
-
-html[data-theme="light"] .stTextInput > div > div > input:focus,
-html[data-theme="light"] .stDateInput > div > div > input:focus {{
-  background: rgba(0,0,0,0.08) !important;
-}}
-
-.stTextInput label, .stDateInput label {{
-  font-weight: 600 !important;
-  color: var(--text-primary) !important;
-  font-size: 0.9rem !important;
-  text-transform: uppercase !important;
-  letter-spacing: 0.5px !important;
-}}
-
-html[data-theme="light"] .stButton > button,
-html[data-theme="light"] .stDownloadButton > button {{
-  background: linear-gradient(135deg, {PRIMARY} 0%, {SECONDARY} 100%) !important;
-  border: none !important;
-  border-radius: 16px !important;
-  padding: 1rem 2.5rem !important;
-  font-size: 1rem !important;
-  font-weight: 700 !important;
-  color: #0A0A0F !important;
-  letter-spacing: 0.5px !important;
-  text-transform: uppercase !important;
-  box-shadow: 0 8px 32px rgba(193,165,236,0.4) !important;
-  transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-  position: relative !important;
-  overflow: hidden !important;
-}}
-
-html[data-theme="dark"] .stButton > button,
-html[data-theme="dark"] .stDownloadButton > button {{
-  background: linear-gradient(135deg, {PRIMARY} 0%, {SECONDARY} 100%) !important;
-  border: none !important;
-  border-radius: 16px !important;
-  padding: 1rem 2.5rem !important;
-  font-size: 1rem !important;
-  font-weight: 700 !important;
-  color: #FFFFFF !important;
-  letter-spacing: 0.5px !important;
-  text-transform: uppercase !important;
-  box-shadow: 0 8px 32px rgba(193,165,236,0.4) !important;
-  transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-  position: relative !important;
-  overflow: hidden !important;
-}}
-
-.stButton > button::before,
-.stDownloadButton > button::before {{
-  content: '';
-  position: absolute;
-  top: 0;
-  left: -100%;
-  width: 100%;
-  height: 100%;
-  background: linear-gradient(90deg, transparent, rgba(255,255,255,0.2), transparent);
-  transition: left 0.5s;
-}}
-
-html[data-theme="light"] .stButton > button:hover,
-html[data-theme="light"] .stDownloadButton > button:hover {{
-  transform: translateY(-2px) !important;
-  box-shadow: 0 12px 48px rgba(193,165,236,0.5) !important;
-  color: #0A0A0F !important;
-}}
-
-html[data-theme="dark"] .stButton > button:hover,
-html[data-theme="dark"] .stDownloadButton > button:hover {{
-  transform: translateY(-2px) !important;
-  box-shadow: 0 12px 48px rgba(193,165,236,0.6) !important;
-  color: #FFFFFF !important;
-}}
-
-.stButton > button:hover::before,
-.stDownloadButton > button:hover::before {{
-  left: 100%;
-}}
-
-html[data-theme="light"] .stButton > button:active,
-html[data-theme="light"] .stDownloadButton > button:active,
-html[data-theme="light"] .stButton > button:focus,
-html[data-theme="light"] .stDownloadButton > button:focus {{
-  color: #0A0A0F !important;
-}}
-
-html[data-theme="dark"] .stButton > button:active,
-html[data-theme="dark"] .stDownloadButton > button:active,
-html[data-theme="dark"] .stButton > button:focus,
-html[data-theme="dark"] .stDownloadButton > button:focus {{
-  color: #FFFFFF !important;
-}}
-
-.stTabs [data-baseweb="tab-list"] {{
-  gap: 1rem;
-  background: rgba(255,255,255,0.03);
-  padding: 0.5rem;
-  border-radius: 16px;
-  border: 1px solid rgba(255,255,255,0.08);
-}}
-
-html[data-theme="light"] .stTabs [data-baseweb="tab-list"] {{
-  background: rgba(0,0,0,0.03);
-  border: 1px solid rgba(0,0,0,0.1);
-}}
-
-.stTabs [data-baseweb="tab"] {{
-  background: transparent;
-  border-radius: 12px;
-  padding: 0.75rem 1.5rem;
-  font-weight: 600;
-  color: var(--text-muted);
-  transition: all 0.3s;
-}}
-
-.stTabs [aria-selected="true"] {{
-  background: linear-gradient(135deg, {PRIMARY}, {SECONDARY});
-  color: #FFFFFF !important;
-  box-shadow: 0 4px 16px rgba(193,165,236,0.3);
-}}
-
-.chart-container {{
-  background: linear-gradient(135deg, 
-    rgba(255,255,255,0.04) 0%, 
-    rgba(193,165,236,0.03) 100%);
-  border: 1px solid rgba(255,255,255,0.08);
-  border-radius: 20px;
-  padding: 1.5rem;
-  margin: 1rem 0;
-  backdrop-filter: blur(10px);
-}}
-
-html[data-theme="light"] .chart-container {{
-  background: linear-gradient(135deg, 
-    rgba(0,0,0,0.02) 0%, 
-    rgba(193,165,236,0.05) 100%);
-  border: 1px solid rgba(0,0,0,0.08);
-}}
-
-::-webkit-scrollbar {{
-  width: 10px;
-  height: 10px;
-}}
-
-::-webkit-scrollbar-track {{
-  background: rgba(255,255,255,0.03);
-}}
-
-html[data-theme="light"] ::-webkit-scrollbar-track {{
-  background: rgba(0,0,0,0.03);
-}}
-
-::-webkit-scrollbar-thumb {{
-  background: linear-gradient(180deg, {PRIMARY}, {SECONDARY});
-  border-radius: 10px;
-}}
-
-::-webkit-scrollbar-thumb:hover {{
-  background: linear-gradient(180deg, {ACCENT}, {PRIMARY});
-}}
-
-.stSpinner > div {{
-  border-top-color: {PRIMARY} !important;
-}}
-
-.info-card {{
-  background: linear-gradient(135deg, 
-    rgba(193,165,236,0.08) 0%, 
-    rgba(139,122,184,0.05) 100%);
-  border: 1px solid rgba(193,165,236,0.2);
-  border-left: 4px solid {PRIMARY};
-  border-radius: 16px;
-  padding: 1.5rem;
-  margin: 1.5rem 0;
-  backdrop-filter: blur(10px);
-}}
-
-html[data-theme="light"] .info-card {{
-  background: linear-gradient(135deg, 
-    rgba(193,165,236,0.10) 0%, 
-    rgba(139,122,184,0.08) 100%);
-  border: 1px solid rgba(193,165,236,0.3);
-  border-left: 4px solid {PRIMARY};
-}}
-
-header[data-testid="stHeader"] {{
-  background: transparent;
-}}
-
-footer {{
-  visibility: hidden;
-}}
-
-#MainMenu {{
-  visibility: hidden;
-}}
-</style>
-""", unsafe_allow_html=True)
+# Served as a static asset (static/theme.css, server.enableStaticServing in .streamlit/config.toml):
+# each rerun only sends a <link> tag, the browser caches the stylesheet itself.
+THEME_CSS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "theme.css")
+
+
+@st.cache_resource
+def theme_tag() -> str:
+    """<link> to the static stylesheet (versioned by content), or an inline <style> if static serving is off."""
+    with open(THEME_CSS, "rb") as f:
+        css = f.read()
+    if st.get_option("server.enableStaticServing"):
+        version = hashlib.sha1(css).hexdigest()[:12]
+        return f'<link rel="stylesheet" href="app/static/theme.css?v={version}">'
+    return f"<style>\n{css.decode('utf-8')}</style>"
+
+
+st.markdown(theme_tag(), unsafe_allow_html=True)
 
 # --------- HERO ---------
 st.markdown("""
@@ -682,62 +85,74 @@ with st.container():
             st.markdown("<br>", unsafe_allow_html=True)
             submitted = st.form_submit_button("🚀 Analyze", use_container_width=True)
 
-if submitted:
-    if not wallet or not wallet.startswith("0x") or len(wallet) < 10:
-        st.error("⚠️ Please enter a valid EVM address (starts with 0x)")
-        st.stop()
+# --------- LOCAL STORE ---------
+@st.cache_resource
+def get_store() -> js.TransferStore:
+    """One SQLite-backed transfer cache shared by every session."""
+    return js.TransferStore()
 
-    jv.WALLET = wallet.strip()
 
-    with st.spinner("🔄 Loading blockchain data..."):
-        chain_map = jv.fetch_chains()
-    
-    if not chain_map:
-        st.error("❌ Could not load chains metadata")
-        st.stop()
+@st.cache_resource
+def get_archive():
+    """Archive raw API responses when JUMPER_ARCHIVE_DIR is set."""
+    if ja.ARCHIVE_DIR:
+        return ja.PageArchive(ja.ARCHIVE_DIR).attach()
+    return None
 
-    from_date_str = since.strftime("%Y-%m-%d")
-    with st.spinner("⚡ Processing transactions..."):
-        txs = jv.fetch_and_process_data(from_date_str, chain_map)
 
-    if not txs:
-        st.markdown("""
-        <div class="info-card">
-            <h3 style="margin:0 0 0.5rem 0;">🔭 No Transfers Found</h3>
-            <p style="margin:0; color: rgba(255,255,255,0.7);">
-                No transactions detected for this wallet in the selected period. 
-                Try adjusting the date range or verify the wallet address.
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        st.stop()
+get_archive()
 
-    analyzer = jv.TransactionAnalyzer()
-    ok = analyzer.analyze_transactions(txs)
-    
-    if not ok:
-        st.warning("⚠️ No analyzable data returned")
-        st.stop()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def cohort_standing(wallet: str) -> dict:
+    """Rank a wallet against every wallet in the local store (empty if the cohort is too small)."""
+    cohort = jc.from_store(get_store())
+    if len(cohort) < jc.COHORT_MIN_SIZE:
+        return {}
+    return cohort.standing(wallet)
+
+
+# --------- RESULT SECTIONS ---------
+def build_results(state: jv.SyncState) -> dict:
+    """Derive everything the result sections need from the sync state."""
+    analyzer = state.analyzer
+    txs = sorted(analyzer.transactions, key=lambda tx: tx["timestamp"], reverse=True)
 
     # --------- BUILD DATAFRAME ---------
     df = pd.DataFrame(txs)
-    
-    # --------- FIXED BLOCKCHAIN EXTRACTION ---------
-    # Use the correct keys from build_transaction_dict: 'from_blockchain' and 'to_blockchain'
-    unique_chains = set()
-    for tx in txs:
-        from_chain = tx.get("from_blockchain")
-        to_chain = tx.get("to_blockchain")
-        
-        if from_chain and str(from_chain).strip():
-            unique_chains.add(str(from_chain).strip())
-        if to_chain and str(to_chain).strip():
-            unique_chains.add(str(to_chain).strip())
-    
-    num_blockchains = len(unique_chains)
 
-    # --------- MEGA KPIs (3 CARDS) ---------
-    st.markdown(f"""
+    # --------- DATA PROCESSING FOR CHARTS ---------
+    if "timestamp" in df.columns:
+        df["date"] = pd.to_datetime(df["timestamp"], unit="s", utc=True).dt.tz_convert("UTC").dt.date
+
+    return {
+        "state": state,
+        "analyzer": analyzer,
+        "txs": txs,
+        "df": df,
+        "chains": sorted(analyzer.chain_counts.items(), key=lambda x: x[1], reverse=True),
+    }
+
+
+@st.cache_data(show_spinner=False)
+def chain_grid_html(sorted_chains: tuple) -> str:
+    """Render the whole chain grid as a single HTML block."""
+    cards = []
+    for chain_name, count in sorted_chains:
+        icon_letter = chain_name[0].upper() if chain_name else "?"
+        cards.append(
+            '<div class="chain-card">'
+            f'<div class="chain-card-icon">{html.escape(icon_letter)}</div>'
+            '<div class="chain-card-body">'
+            f'<div class="chain-card-name">{html.escape(chain_name)}</div>'
+            f'<div class="chain-card-count">{count} interaction{"s" if count != 1 else ""}</div>'
+            '</div></div>'
+        )
+    return f'<div class="chain-grid">{"".join(cards)}</div>'
+
+
+def kpi_html(analyzer: jv.TransactionAnalyzer) -> str:
+    return f"""
     <div class="kpi-grid">
         <div class="kpi-card">
             <div class="kpi-icon">📊</div>
@@ -755,7 +170,15 @@ if submitted:
             <div class="kpi-value">${analyzer.swap_value:,.0f}</div>
         </div>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+
+def render_kpis(results: dict):
+    analyzer = results["analyzer"]
+    num_blockchains = len(results["chains"])
+
+    # --------- MEGA KPIs (3 CARDS) ---------
+    st.markdown(kpi_html(analyzer), unsafe_allow_html=True)
 
     # --------- BLOCKCHAIN COUNTER ---------
     st.markdown(f"""
@@ -765,176 +188,612 @@ if submitted:
     </div>
     """, unsafe_allow_html=True)
 
-    # --------- DATA PROCESSING FOR CHARTS ---------
-    if "timestamp" in df.columns:
-        df["date"] = pd.to_datetime(df["timestamp"], unit="s", utc=True).dt.tz_convert("UTC").dt.date
+    # --------- COHORT STANDING ---------
+    standing = cohort_standing(results["state"].wallet or "")
+    if standing:
+        badges = "".join(
+            f'<div class="chain-badge"><span class="chain-badge-name">{jc.top_label(rank)}</span>'
+            f'<span class="chain-badge-count">#{rank["rank"]} of {rank["cohort"]}</span></div>'
+            for rank in standing.values()
+        )
+        st.markdown(f'<div class="chain-badges">{badges}</div>', unsafe_allow_html=True)
+
+
+@st.fragment
+def render_platforms(results: dict):
+    analyzer = results["analyzer"]
+    df = results["df"]
+
+    platforms = None
+    if hasattr(analyzer, "platforms") and analyzer.platforms:
+        platforms = analyzer.platforms
+    elif "platform" in df.columns:
+        platforms = df["platform"].value_counts().to_dict()
+
+    if platforms:
+        pf = pd.DataFrame([
+            {"platform": k, "count": v}
+            for k, v in platforms.items()
+        ]).sort_values("count", ascending=False)
+
+        fig = px.bar(
+            pf,
+            x="platform",
+            y="count",
+            labels={"count": "Transactions", "platform": "Platform"}
+        )
+
+        fig.update_traces(
+            marker_color=PRIMARY,
+            hovertemplate="<b>%{x}</b><br>%{y} transactions<extra></extra>"
+        )
+
+        fig.update_layout(
+            height=400,
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="#FFFFFF", family="Inter"),
+            margin=dict(l=20, r=20, t=20, b=20),
+            xaxis=dict(
+                gridcolor="rgba(255,255,255,0.06)",
+                showgrid=False
+            ),
+            yaxis=dict(
+                gridcolor="rgba(255,255,255,0.06)",
+                showgrid=True
+            ),
+            showlegend=False
+        )
+
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.plotly_chart(fig, use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    else:
+        st.info("📊 Platform data unavailable")
+
+
+def activity_frame(txs: list) -> pd.DataFrame:
+    """Downsample transfers server-side into at most jv.CHART_MAX_POINTS buckets.
+    Not cached: hashing the transfer list costs far more than bucketize itself."""
+    buckets = pd.DataFrame(jv.bucketize(txs))
+    if not buckets.empty:
+        buckets["date"] = pd.to_datetime(buckets["timestamp"], unit="s", utc=True)
+    return buckets
+
+
+@st.fragment
+def render_activity(results: dict):
+    buckets = activity_frame(results["txs"])
+
+    if not buckets.empty:
+        fig = go.Figure()
+        fig.add_bar(
+            x=buckets["date"],
+            y=buckets["sum"],
+            customdata=buckets[["count", "min", "max"]],
+            marker_color=PRIMARY,
+            name="Volume",
+            hovertemplate=(
+                "<b>%{x}</b><br>$%{y:,.0f} volume<br>%{customdata[0]} transfers"
+                "<br>min $%{customdata[1]:,.2f} • max $%{customdata[2]:,.2f}<extra></extra>"
+            ),
+        )
+        fig.add_scatter(
+            x=buckets["date"],
+            y=buckets["max"],
+            mode="lines",
+            line=dict(color=ACCENT, width=1, dash="dot"),
+            name="Largest transfer",
+            hoverinfo="skip",
+        )
+
+        fig.update_layout(
+            height=400,
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="#FFFFFF", family="Inter"),
+            margin=dict(l=20, r=20, t=20, b=20),
+            xaxis=dict(
+                gridcolor="rgba(255,255,255,0.06)",
+                showgrid=False
+            ),
+            yaxis=dict(
+                gridcolor="rgba(255,255,255,0.06)",
+                showgrid=True,
+                title="USD"
+            ),
+            showlegend=False
+        )
+
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.plotly_chart(fig, use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    else:
+        st.info("📊 No dated transfers available")
+
+
+@st.fragment
+def render_sizes(results: dict):
+    analyzer = results["analyzer"]
+    sizes = analyzer.sizes
+
+    if sizes.count <= 0:
+        st.info("📊 No transfer sizes available")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Median transfer", jv.usd_fmt(sizes.quantile(0.5)))
+    col2.metric("p90 transfer", jv.usd_fmt(sizes.quantile(0.9)))
+    col3.metric("p99 transfer", jv.usd_fmt(sizes.quantile(0.99)))
+
+    hist = pd.DataFrame(sizes.histogram(), columns=["low", "high", "count"])
+    hist["bucket"] = [
+        "$0" if high == 0 else f"${low:,.2g}–${high:,.2g}"
+        for low, high in zip(hist["low"], hist["high"])
+    ]
+    fig = px.bar(hist, x="bucket", y="count", labels={"bucket": "Transfer size (USD)", "count": "Transfers"})
+    fig.update_traces(
+        marker_color=PRIMARY,
+        hovertemplate="<b>%{x}</b><br>%{y} transfers<extra></extra>"
+    )
+    fig.update_layout(
+        height=320,
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#FFFFFF", family="Inter"),
+        margin=dict(l=20, r=20, t=20, b=20),
+        xaxis=dict(showgrid=False),
+        yaxis=dict(gridcolor="rgba(255,255,255,0.06)", showgrid=True),
+        showlegend=False
+    )
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    st.plotly_chart(fig, use_container_width=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    by = st.radio("Breakdown", ["platform", "route"], horizontal=True, key="sizes_by")
+    stats = pd.DataFrame(analyzer.size_stats(by))
+    st.dataframe(
+        stats,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "count": st.column_config.NumberColumn("Transfers"),
+            "p50": st.column_config.NumberColumn("Median", format="$%.2f"),
+            "p90": st.column_config.NumberColumn("p90", format="$%.2f"),
+            "p99": st.column_config.NumberColumn("p99", format="$%.2f"),
+        },
+    )
+
+
+@st.fragment
+def render_latency(results: dict):
+    analyzer = results["analyzer"]
+    latencies = analyzer.latencies
+
+    if latencies.count <= 0:
+        st.info("⏱️ No completed bridges with both legs timestamped")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Median settlement", jv.duration_fmt(latencies.quantile(0.5)))
+    col2.metric("p90 settlement", jv.duration_fmt(latencies.quantile(0.9)))
+    col3.metric("p99 settlement", jv.duration_fmt(latencies.quantile(0.99)))
+
+    by = st.radio("Breakdown", ["platform", "route"], horizontal=True, key="latency_by")
+    stats = pd.DataFrame(analyzer.latency_stats(by)).sort_values("p50")
+    st.caption("Fastest first – time from the sending transaction to the receiving one")
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=stats["p50"] / 60, y=stats[by], orientation="h", name="Median",
+        marker_color=PRIMARY,
+        hovertemplate="<b>%{y}</b><br>Median %{x:.1f} min<extra></extra>",
+    ))
+    fig.add_trace(go.Bar(
+        x=stats["p90"] / 60, y=stats[by], orientation="h", name="p90",
+        marker_color="rgba(255,255,255,0.25)",
+        hovertemplate="<b>%{y}</b><br>p90 %{x:.1f} min<extra></extra>",
+    ))
+    fig.update_layout(
+        barmode="overlay",
+        height=max(240, 32 * len(stats) + 80),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#FFFFFF", family="Inter"),
+        margin=dict(l=20, r=20, t=20, b=20),
+        xaxis=dict(title="Minutes", gridcolor="rgba(255,255,255,0.06)", showgrid=True),
+        yaxis=dict(showgrid=False, autorange="reversed"),
+        legend=dict(orientation="h", y=1.08),
+    )
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    st.plotly_chart(fig, use_container_width=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    table = stats.copy()
+    for col in ("p50", "p90", "p99"):
+        table[col] = table[col].map(jv.duration_fmt)
+    st.dataframe(
+        table,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "count": st.column_config.NumberColumn("Bridges"),
+            "p50": st.column_config.TextColumn("Median"),
+            "p90": st.column_config.TextColumn("p90"),
+            "p99": st.column_config.TextColumn("p99"),
+        },
+    )
+
+
+TABLE_COLUMNS = {
+    "timestamp": "When",
+    "tx_id": "Tx",
+    "platform": "Platform",
+    "from_blockchain": "From chain",
+    "from_amount": "From amount",
+    "from_token": "From token",
+    "to_blockchain": "To chain",
+    "to_amount": "To amount",
+    "to_token": "To token",
+    "usd_value": "USD value",
+    "status": "Status",
+}
+
+
+def filter_transfers(df: pd.DataFrame, search: str, platforms: list, kind: str) -> pd.DataFrame:
+    """Server-side filtering on the cached DataFrame (boolean masks, no row loop)."""
+    mask = pd.Series(True, index=df.index)
+    if platforms:
+        mask &= df["platform"].isin(platforms)
+    if kind == "Bridges":
+        mask &= df["from_blockchain"] != df["to_blockchain"]
+    elif kind == "Swaps":
+        mask &= df["from_blockchain"] == df["to_blockchain"]
+    if search:
+        needle = search.strip().lower()
+        haystack = (
+            df["tx_hash"].str.lower() + " " + df["from_token"].str.lower() + " " + df["to_token"].str.lower()
+            + " " + df["from_blockchain"].str.lower() + " " + df["to_blockchain"].str.lower()
+        )
+        mask &= haystack.str.contains(needle, regex=False)
+    return df[mask]
+
+
+def format_page(page: pd.DataFrame) -> pd.DataFrame:
+    """Vectorized equivalent of jv.iso_and_relative / jv.usd_fmt, applied to the visible slice only."""
+    out = page[list(TABLE_COLUMNS)].copy()
+
+    when = pd.to_datetime(page["timestamp"], unit="s", utc=True)
+    mins = ((pd.Timestamp.now(tz="UTC") - when).dt.total_seconds() // 60).astype("int64")
+    hours, rem = mins // 60, mins % 60
+    hours_str = hours.astype(str) + " hours"
+    mins_str = rem.astype(str) + " minutes"
+    relative = hours_str.where(hours > 0, mins_str)
+    relative = relative.mask((hours > 0) & (rem > 0), hours_str + ", " + mins_str)
+    out["timestamp"] = relative + " ago • " + when.dt.strftime("%d %b %Y (%H:%M UTC)")
+
+    out["usd_value"] = "$" + page["usd_value"].fillna(0).map("{:,.4f}".format).str.replace(",", " ")
+    return out.rename(columns=TABLE_COLUMNS)
+
+
+@st.fragment
+def render_transfers(results: dict):
+    df = results["df"]
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        search = st.text_input("Search", placeholder="Hash (either leg), token or chain", key="tx_search")
+    with col2:
+        platforms = st.multiselect("Platform", sorted(results["analyzer"].platforms), key="tx_platforms")
+    with col3:
+        kind = st.selectbox("Type", ["All", "Bridges", "Swaps"], key="tx_kind")
+
+    # A full hash of either leg (e.g. the destination-chain tx) resolves to its transfer
+    match = results["state"].lookup(search.strip()) if search else None
+    filtered = filter_transfers(df, match["tx_hash"] if match else search, platforms, kind)
+
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+    with col1:
+        sort_by = st.selectbox(
+            "Sort by", list(TABLE_COLUMNS), format_func=TABLE_COLUMNS.get, key="tx_sort"
+        )
+    with col2:
+        descending = st.toggle("Descending", value=True, key="tx_desc")
+    with col3:
+        page_size = st.selectbox("Rows", [25, 50, 100], key="tx_page_size")
+    pages = max(1, -(-len(filtered) // page_size))
+    with col4:
+        page_no = st.number_input("Page", min_value=1, max_value=pages, value=1, key="tx_page")
+
+    # Rows are only ordered up to the visible page, and only that slice is formatted and sent
+    start = (min(page_no, pages) - 1) * page_size
+    column = filtered[sort_by]
+    if pd.api.types.is_numeric_dtype(column):
+        top = column.nlargest if descending else column.nsmallest
+        order = top(start + page_size).index
+    else:
+        order = column.sort_values(ascending=not descending).index
+    page = filtered.loc[order[start:start + page_size]]
+
+    st.caption(f"{len(filtered):,} matching transfers • page {min(page_no, pages)} of {pages}")
+    st.dataframe(format_page(page), hide_index=True, use_container_width=True)
+
+
+@st.fragment
+def render_query(results: dict):
+    state = results["state"]
+    df = results["df"]
+    chain_ids = {
+        name: cid
+        for name, cid in zip(df.get("from_blockchain", []), df.get("from_chain_id", []))
+        if pd.notna(cid)
+    }
+
+    col1, col2, col3, col4 = st.columns([2, 1.5, 1.5, 1])
+    with col1:
+        first = dt.datetime.fromtimestamp(df["timestamp"].min(), tz=dt.timezone.utc).date()
+        last = dt.datetime.fromtimestamp(df["timestamp"].max(), tz=dt.timezone.utc).date()
+        period = st.date_input("Period", value=(first, last), key="query_period")
+    with col2:
+        source = st.selectbox("Source chain", ["All"] + sorted(chain_ids), key="query_source")
+    with col3:
+        platform = st.selectbox("Platform", ["All"] + sorted(results["analyzer"].platforms), key="query_platform")
+    with col4:
+        kind = st.selectbox("Type", ["All", "bridge", "swap"], key="query_kind")
+
+    if len(period) != 2:
+        st.info("📅 Select a start and an end date")
+        return
+
+    summary = get_store().summary(
+        state.wallet,
+        start=jv.to_unix(period[0].strftime("%Y-%m-%d")),
+        end=jv.to_unix(period[1].strftime("%Y-%m-%d")) + 86399,
+        from_chain_id=None if source == "All" else chain_ids[source],
+        platform=None if platform == "All" else platform,
+        kind=None if kind == "All" else kind,
+    )
+
+    st.markdown(f"""
+    <div class="kpi-grid">
+        <div class="kpi-card">
+            <div class="kpi-label">Matching Transfers</div>
+            <div class="kpi-value">{summary["transactions"]:,}</div>
+        </div>
+        <div class="kpi-card">
+            <div class="kpi-label">Bridge Volume</div>
+            <div class="kpi-value">${summary["bridge_value"]:,.0f}</div>
+        </div>
+        <div class="kpi-card">
+            <div class="kpi-label">Swap Volume</div>
+            <div class="kpi-value">${summary["swap_value"]:,.0f}</div>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+
+@st.fragment
+def render_chains(results: dict):
+    sorted_chains = results["chains"]
 
-    # --------- INSIGHTS SECTION ---------
+    if sorted_chains:
+        st.markdown(f"""
+        <div style="margin-bottom: 1.5rem;">
+            <h4 style="margin: 0;">⛓️ Blockchains Used ({len(sorted_chains)})</h4>
+            <p style="margin: 0.5rem 0 0 0; color: var(--text-muted); font-size: 0.9rem;">
+                Sorted by interaction frequency
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        st.markdown(chain_grid_html(tuple(sorted_chains)), unsafe_allow_html=True)
+    else:
+        st.info("📊 No blockchain data available")
 
+
+def render_insights(results: dict):
     st.markdown("### 📈 Detailed Insights")
     
-    tab1, tab2 = st.tabs(["🏢 Platform Analytics", "⛓️ Chains Used"])
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs(
+        ["🏢 Platform Analytics", "📅 Activity", "📏 Transfer Sizes", "⏱️ Bridge Latency", "⛓️ Chains Used",
+         "🧾 Transfers", "🔎 Query"]
+    )
 
     with tab1:
-        platforms = None
-        if hasattr(analyzer, "platforms") and analyzer.platforms:
-            platforms = analyzer.platforms
-        elif "platform" in df.columns:
-            platforms = df["platform"].value_counts().to_dict()
-        
-        if platforms:
-            pf = pd.DataFrame([
-                {"platform": k, "count": v} 
-                for k, v in platforms.items()
-            ]).sort_values("count", ascending=False)
-            
-            fig = px.bar(
-                pf, 
-                x="platform", 
-                y="count",
-                labels={"count": "Transactions", "platform": "Platform"}
-            )
-            
-            fig.update_traces(
-                marker_color=PRIMARY,
-                hovertemplate="<b>%{x}</b><br>%{y} transactions<extra></extra>"
-            )
-            
-            fig.update_layout(
-                height=400,
-                paper_bgcolor="rgba(0,0,0,0)",
-                plot_bgcolor="rgba(0,0,0,0)",
-                font=dict(color="#FFFFFF", family="Inter"),
-                margin=dict(l=20, r=20, t=20, b=20),
-                xaxis=dict(
-                    gridcolor="rgba(255,255,255,0.06)",
-                    showgrid=False
-                ),
-                yaxis=dict(
-                    gridcolor="rgba(255,255,255,0.06)",
-                    showgrid=True
-                ),
-                showlegend=False
-            )
-            
-            st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-            st.plotly_chart(fig, use_container_width=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-        else:
-            st.info("📊 Platform data unavailable")
+        render_platforms(results)
 
     with tab2:
-        # Count chain usages with correct keys
-        chain_counts = {}
-        for tx in txs:
-            from_chain = tx.get("from_blockchain")
-            to_chain = tx.get("to_blockchain")
-            
-            if from_chain and str(from_chain).strip():
-                chain_name = str(from_chain).strip()
-                chain_counts[chain_name] = chain_counts.get(chain_name, 0) + 1
-            
-            if to_chain and str(to_chain).strip():
-                chain_name = str(to_chain).strip()
-                chain_counts[chain_name] = chain_counts.get(chain_name, 0) + 1
-        
-        if chain_counts:
-            # Sort by usage (most used first)
-            sorted_chains = sorted(chain_counts.items(), key=lambda x: x[1], reverse=True)
-            
-            st.markdown(f"""
-            <div style="margin-bottom: 1.5rem;">
-                <h4 style="margin: 0;">⛓️ Blockchains Used ({len(sorted_chains)})</h4>
-                <p style="margin: 0.5rem 0 0 0; color: var(--text-muted); font-size: 0.9rem;">
-                    Sorted by interaction frequency
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Display chains in a grid
-            cols_per_row = 2
-            for i in range(0, len(sorted_chains), cols_per_row):
-                cols = st.columns(cols_per_row)
-                for j, col in enumerate(cols):
-                    if i + j < len(sorted_chains):
-                        chain_name, count = sorted_chains[i + j]
-                        icon_letter = chain_name[0].upper() if chain_name else "?"
-                        
-                        with col:
-                            st.markdown(f"""
-                            <div style="
-                                background: linear-gradient(135deg, rgba(193,165,236,0.15), rgba(139,122,184,0.1));
-                                border: 1.5px solid rgba(193,165,236,0.3);
-                                border-radius: 16px;
-                                padding: 1.25rem;
-                                margin-bottom: 1rem;
-                                backdrop-filter: blur(20px);
-                                transition: all 0.3s;
-                            ">
-                                <div style="display: flex; align-items: center; gap: 12px;">
-                                    <div style="
-                                        width: 40px;
-                                        height: 40px;
-                                        border-radius: 50%;
-                                        background: linear-gradient(135deg, {PRIMARY}, {SECONDARY});
-                                        display: flex;
-                                        align-items: center;
-                                        justify-content: center;
-                                        font-weight: 700;
-                                        font-size: 1.1rem;
-                                        color: #FFF;
-                                        box-shadow: 0 4px 12px rgba(193,165,236,0.3);
-                                        flex-shrink: 0;
-                                    ">
-                                        {icon_letter}
-                                    </div>
-                                    <div style="flex: 1; min-width: 0;">
-                                        <div style="
-                                            font-weight: 600;
-                                            font-size: 1rem;
-                                            color: var(--text-primary);
-                                            margin-bottom: 0.25rem;
-                                            white-space: nowrap;
-                                            overflow: hidden;
-                                            text-overflow: ellipsis;
-                                        ">
-                                            {chain_name}
-                                        </div>
-                                        <div style="
-                                            font-size: 0.85rem;
-                                            color: var(--text-muted);
-                                            font-weight: 500;
-                                        ">
-                                            {count} interaction{"s" if count != 1 else ""}
-                                        </div>
-                                    </div>
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
-        else:
-            st.info("📊 No blockchain data available")
+        render_activity(results)
 
-    # --------- EXPORT SECTION ---------
+    with tab3:
+        render_sizes(results)
+
+    with tab4:
+        render_latency(results)
+
+    with tab5:
+        render_chains(results)
+
+    with tab6:
+        render_transfers(results)
+
+    with tab7:
+        render_query(results)
+
+
+def render_live(results: dict):
+    """Poll for transfers newer than the last one seen and fold them in."""
+    # Fragment reruns replay the original arguments, the session holds the latest
+    results = st.session_state.get("results", results)
+    state = results["state"]
+    if state.poll():
+        results = st.session_state["results"] = build_results(state)
+    st.caption(f"🟢 Live • last poll {jv.iso_and_relative(state.last_sync)}")
+    render_kpis(results)
+    render_insights(results)
+
+
+@st.fragment
+def render_export(results: dict):
     st.markdown("### 📥 Data Export")
-    
+
     st.markdown("""
     <div class="glass-card">
         <h4 style="margin: 0 0 1rem 0;">Download Complete Dataset</h4>
         <p style="margin: 0; color: rgba(255,255,255,0.7); line-height: 1.6;">
-            Download the full CSV below – the detailed table is intentionally hidden on the page 
-            to maintain a clean, focused interface. Export for further analysis or integration with your tools.
+            Download the full CSV below – the Transfers tab only pages through the dataset 
+            to keep the interface fast. Export for further analysis or integration with your tools.
         </p>
     </div>
     """, unsafe_allow_html=True)
-    
+
     st.download_button(
         "📄 Download CSV Report",
-        df.to_csv(index=False).encode("utf-8"),
+        results["df"].to_csv(index=False).encode("utf-8"),
         "jumper_analytics_report.csv",
         "text/csv",
         use_container_width=True
     )
 
+
+def render_worker_status():
+    """Scheduler state of the background worker (jumper_worker.py), if it ever ran."""
+    rows = get_store().worker_status()
+    if not rows:
+        return
+    with st.expander(f"🛠️ Background worker – {len(rows)} watched wallet{'s' if len(rows) != 1 else ''}"):
+        now = dt.datetime.now(dt.timezone.utc).timestamp()
+        st.dataframe(
+            pd.DataFrame([{
+                "Wallet": row["wallet"],
+                "Transfers": row["transactions"] or 0,
+                "Last run": f"{row['duration']:.1f}s",
+                "Staleness": f"{row['staleness'] / 60:.0f} min" if row["staleness"] is not None else "never",
+                "Next run": f"in {max(0, row['next_run'] - now) / 60:.0f} min" if row["next_run"] else "–",
+                "Status": "✅ OK" if row["ok"] else f"❌ {row['error']}",
+            } for row in rows]),
+            hide_index=True,
+            use_container_width=True,
+        )
+
+
+crawl = st.session_state.pop("crawl", None)
+if crawl is not None and not submitted:
+    # The previous run was interrupted mid-crawl (Cancel): keep what was fetched
+    crawl.complete = False
+    if crawl.analyzer.transactions:
+        st.session_state["results"] = build_results(crawl)
+
+if submitted:
+    st.session_state.pop("results", None)
+
+    if not wallet or not wallet.startswith("0x") or len(wallet) < 10:
+        st.error("⚠️ Please enter a valid EVM address (starts with 0x)")
+        st.stop()
+
+    # Local to this session: jv.WALLET is a module global shared by every concurrent session
+    wallet = wallet.strip()
+    from_date_str = since.strftime("%Y-%m-%d")
+    from_ts = jv.to_unix(from_date_str)
+
+    # Watched wallets are precomputed by the background worker: instant first paint
+    state, age = get_store().load_materialized(wallet, from_ts)
+    if state is not None:
+        results = st.session_state["results"] = build_results(state)
+        results["materialized_age"] = age
+        st.rerun()
+
+    with st.spinner("🔄 Loading blockchain data..."):
+        chain_map = jv.fetch_chains()
+    
+    if not chain_map:
+        # Cold start with the API down: no chain list yet, but cached transfers are already normalized
+        store = get_store()
+        state = jv.SyncState(wallet, chain_map, store=store)
+        state.ingest_transactions(store.query(wallet, start=from_ts))
+        if not state.analyzer.transactions:
+            st.error("❌ Could not load chains metadata")
+            st.stop()
+        state.stale = True
+        state.last_sync = (store.coverage(wallet) or (0, 0))[1]
+    else:
+        state = jv.SyncState(wallet, chain_map, store=get_store())
+
+        # Kept in the session while crawling: Cancel (like any rerun) interrupts this
+        # script run, and the next run picks up the transfers fetched so far
+        st.session_state["crawl"] = state
+        progress_bar = st.progress(0.0, text="⚡ Fetching transfers...")
+        live_kpis = st.empty()
+        st.button("⏹️ Cancel", key="cancel_crawl", help="Stop fetching and analyze what was already received")
+
+        def show_progress(progress: dict):
+            position = progress["position"]
+            when = dt.datetime.fromtimestamp(position, tz=dt.timezone.utc).strftime("%d %b %Y") if position else "…"
+            progress_bar.progress(
+                progress["fraction"],
+                text=f"⚡ {progress['pages']} pages • {progress['transfers']:,} transfers • reached {when}",
+            )
+            live_kpis.markdown(kpi_html(state.analyzer), unsafe_allow_html=True)
+
+        state.load(from_ts, on_page=show_progress)
+        st.session_state.pop("crawl", None)
+        progress_bar.empty()
+        live_kpis.empty()
+
+    if not state.analyzer.transactions:
+        st.markdown("""
+        <div class="info-card">
+            <h3 style="margin:0 0 0.5rem 0;">🔭 No Transfers Found</h3>
+            <p style="margin:0; color: rgba(255,255,255,0.7);">
+                No transactions detected for this wallet in the selected period. 
+                Try adjusting the date range or verify the wallet address.
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+        st.stop()
+
+    if state.stale:
+        st.warning("⚠️ LI.FI API unavailable – showing cached transfers, numbers may be out of date")
+
+    # Results live in the session so fragment reruns don't need the form
+    st.session_state["results"] = build_results(state)
+
+results = st.session_state.get("results")
+
+if results:
+    state = results["state"]
+    if not state.complete:
+        st.info(f"⏹️ Crawl cancelled – showing the {len(state.analyzer.transactions):,} transfers fetched so far")
+
+    col_status, col_follow, col_refresh = st.columns([3, 1, 1])
+    with col_status:
+        precomputed = (
+            f" • ⚡ precomputed by the background worker {results['materialized_age'] / 60:.0f} min ago"
+            if "materialized_age" in results else ""
+        )
+        st.caption(
+            f"Last sync {jv.iso_and_relative(state.last_sync)} • "
+            f"{len(state.pending)} pending transfer{'s' if len(state.pending) != 1 else ''}{precomputed}"
+        )
+    with col_follow:
+        following = st.toggle("Live follow", help=f"Poll for new transfers every {jv.FOLLOW_INTERVAL}s")
+    with col_refresh:
+        if st.button("🔄 Refresh", use_container_width=True):
+            with st.spinner("🔄 Re-polling pending transfers..."):
+                state.refresh()
+            results = st.session_state["results"] = build_results(state)
+
+    # --------- KPIs & INSIGHTS SECTION ---------
+    if following:
+        st.fragment(render_live, run_every=jv.FOLLOW_INTERVAL)(results)
+    else:
+        st.fragment(render_kpis)(results)
+        render_insights(results)
+
+    # --------- EXPORT SECTION ---------
+    render_export(results)
+    render_worker_status()
+
 else:
     # --------- EMPTY STATE ---------
     st.markdown("""